@@ -14,9 +14,11 @@
 
 from __future__ import annotations
 import re
+import time
+import hashlib
 import pygame
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, Union
 
 # ---------------------------------------------------------------------------------------------------------------- #
 # ---------------------------------------------------------------------------------------------------------------- #
@@ -34,10 +36,11 @@ class ARDraw:
 
     # ---------------------------------------------------------------------------------------------------------------- #
 
-    def __init__(self, tile_size: int, tileset_path: str) -> None:
+    # The tileset is either a path to an image file or an already decoded surface (ex. from the asset bundle)
+    def __init__(self, tile_size: int, tileset: Union[str, pygame.Surface]) -> None:
         self.tile_size = tile_size
         self.char_to_tile: Dict[str, pygame.Surface] = {}
-        self.tile_set: List[pygame.Surface] = self.__load_tileset(tile_size=tile_size, tileset_path=tileset_path)
+        self.tile_set: List[pygame.Surface] = self.__load_tileset(tile_size=tile_size, tileset=tileset)
 
     # ---------------------------------------------------------------------------------------------------------------- #
 
@@ -48,8 +51,8 @@ class ARDraw:
     # ---------------------------------------------------------------------------------------------------------------- #
 
     # Load the tileset asset and create a list of tiles
-    def __load_tileset(self, tile_size: int, tileset_path: str) -> List[pygame.Surface]:
-        tileset_image = pygame.image.load(tileset_path).convert_alpha()
+    def __load_tileset(self, tile_size: int, tileset: Union[str, pygame.Surface]) -> List[pygame.Surface]:
+        tileset_image = (pygame.image.load(tileset) if isinstance(tileset, str) else tileset).convert_alpha()
         rows = tileset_image.get_height() // tile_size
         cols = tileset_image.get_width() // tile_size
         tiles = []
@@ -142,6 +145,21 @@ class ARDraw:
                 char_surface.blit(tinted_tile, (0, 0))
                 screen.blit(char_surface, (x, y))
 
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Render template lines onto their own surface so the layer can be cached and blitted each frame
+    def render_layer(
+        self,
+        lines: List[str],
+        fg: Tuple[int, int, int],
+        bg: Tuple[int, int, int],
+    ) -> pygame.Surface:
+        cols = max((len(line) for line in lines), default=0)
+        layer = pygame.Surface((max(cols, 1) * self.tile_size, max(len(lines), 1) * self.tile_size), pygame.SRCALPHA)
+        for row, line in enumerate(lines):
+            self.draw_text(layer, line, 0, row, fg, bg)
+        return layer
+
 
 # ---------------------------------------------------------------------------------------------------------------- #
 # ---------------------------------------------------------------------------------------------------------------- #
@@ -152,15 +170,20 @@ class ARTemplate:
 
     # ---------------------------------------------------------------------------------------------------------------- #
 
+    # With strict set, read errors are raised to the caller instead of being reported and replaced by an empty part
     @staticmethod
-    def _parse_scene_template_part(file_path: str) -> List[str]:
+    def parse_scene_template_part(file_path: str, strict: bool = False) -> List[str]:
         try:
             with open(file_path, "r", encoding="utf-8") as file:
                 return [line.rstrip("\n") for line in file]
         except FileNotFoundError:
+            if strict:
+                raise
             print(f"[AsciiRend] File not found: {file_path}")
             return []
         except Exception as e:
+            if strict:
+                raise
             print(f"[AsciiRend] Unknown error loading scene template: {file_path}")
             return []
 
@@ -192,9 +215,32 @@ class ARTemplate:
         except ValueError:
             return s
 
+    # Find the {{name}} or {{name:width}} fields in a part and blank them out, so the part renders as a static
+    # frame and a panel can draw its live values into the gaps. A field is as wide as its token unless a width is
+    # given. Returns the blanked lines and, per name, the (col, row, width) of each field, top to bottom.
+    @staticmethod
+    def parse_fields(
+        lines: List[str],
+        _FIELD_RE: re.Pattern[str] = re.compile(r"\{\{(\w+)(?::(\d+))?\}\}"),
+    ) -> Tuple[List[str], Dict[str, List[Tuple[int, int, int]]]]:
+        blanked: List[str] = []
+        fields: Dict[str, List[Tuple[int, int, int]]] = {}
+        for row, line in enumerate(lines):
+            out = ""
+            end = 0
+            for m in _FIELD_RE.finditer(line):
+                out += line[end : m.start()]
+                width = int(m.group(2)) if m.group(2) else len(m.group(0))
+                fields.setdefault(m.group(1), []).append((len(out), row, width))
+                out += " " * width
+                end = m.end()
+            blanked.append(out + line[end:])
+        return blanked, fields
+
     @staticmethod
     def parse_scene_template(
         path: str,
+        root: Optional[str] = None,
         _PART_RE=re.compile(r"\[\s*(\d+)\s*,\s*(\d+)\s*\]\s+(.+)$"),
         _KV_RE=re.compile(r"^\s*([^:#=\s]+)\s*[:=]\s*(.+?)\s*$"),
     ) -> Tuple[Dict[str, Any], List[Tuple[int, int, str, List[str]]]]:
@@ -204,9 +250,10 @@ class ARTemplate:
             key2 = value2
             ---
             [ x, y] parts/whatever.txt
+        Part paths are resolved against root when given, otherwise against the working directory.
         Returns: (front_matter, parts)
         - front_matter: dict[str, Any]
-        - parts: list of (x, y, file_path)
+        - parts: list of (x, y, file_path, lines)
         """
         p = Path(path)
         if not p.exists():
@@ -244,6 +291,83 @@ class ARTemplate:
                         # ignore lines that don’t match the placement syntax
                         continue
                     x, y, file_path = int(m.group(1)), int(m.group(2)), m.group(3).strip()
-                    template_lines = ARTemplate._parse_scene_template_part(file_path)
+                    if root is not None:
+                        file_path = str(Path(root) / file_path)
+                    template_lines = ARTemplate.parse_scene_template_part(file_path)
                     scene_templates.append((x, y, file_path, template_lines))
         return scene_attributes, scene_templates
+
+
+# ---------------------------------------------------------------------------------------------------------------- #
+# ---------------------------------------------------------------------------------------------------------------- #
+# ---------------------------------------------------------------------------------------------------------------- #
+
+
+class ARWatcher:
+    """
+    Polls a set of files for changes without any external service.
+    The cheap mtime/size check runs on every poll; the content hash is only computed when
+    it reports a difference, so saving a file without changing it does not trigger a reload.
+    """
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    def __init__(self, paths: List[str], interval: float = 0.25) -> None:
+        self.interval = interval
+        self._last_poll = 0.0
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self._hashes: Dict[str, Optional[str]] = {}
+        for path in paths:
+            self.watch(path)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    @staticmethod
+    def _stat(path: str) -> Tuple[int, int]:
+        try:
+            st = Path(path).stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return 0, -1
+
+    @staticmethod
+    def _hash(path: str) -> Optional[str]:
+        try:
+            return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Start tracking a file, recording its current state as the baseline
+    def watch(self, path: str) -> None:
+        self._stats[path] = self._stat(path)
+        self._hashes[path] = self._hash(path)
+
+    # Stop tracking any file not in the given list (ex. a part removed from the layout)
+    def retain(self, paths: List[str]) -> None:
+        for path in list(self._stats):
+            if path not in paths:
+                del self._stats[path]
+                del self._hashes[path]
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Return the files whose contents changed since the last poll, at most once per interval
+    def poll(self) -> List[str]:
+        now = time.monotonic()
+        if now - self._last_poll < self.interval:
+            return []
+        self._last_poll = now
+
+        changed: List[str] = []
+        for path, old_stat in self._stats.items():
+            new_stat = self._stat(path)
+            if new_stat == old_stat:
+                continue
+            self._stats[path] = new_stat
+            new_hash = self._hash(path)
+            if new_hash != self._hashes[path]:
+                self._hashes[path] = new_hash
+                changed.append(path)
+        return changed
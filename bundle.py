@@ -0,0 +1,227 @@
+# bundle.py
+# Packed asset bundle: decoded tileset pixels, compiled scene layouts and game.ini in one indexed file.
+#
+# Layout of a bundle file (little endian):
+#   header   MAGIC, format version, index offset, index length
+#   data     one section per entry, each aligned to SECTION_ALIGN bytes
+#   index    JSON object: name -> {"kind", "offset", "length", ...kind specific fields}
+#
+# The "sources" entry records the size, mtime and hash of every file the bundle was built from. A bundle older
+# than any of those files is stale and the game falls back to the loose files, so edits are never masked. A
+# source whose mtime moved without its content changing is recorded in a small ".verified" file next to the
+# bundle, so it is hashed once rather than on every start.
+# The game maps the file once and hands out memoryview slices of it, so images are wrapped by pygame without
+# copying and the whole file is read front to back by the OS in one sequential pass.
+# Build with "python make.py bundle"; when no bundle exists the game loads the loose files instead.
+
+from __future__ import annotations
+import hashlib
+import json
+import mmap
+import os
+import struct
+import pygame
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from ascii_rend import ARTemplate
+
+MAGIC = b"ST78BNDL"
+VERSION = 2
+HEADER = struct.Struct("<8sHHQQ")
+SECTION_ALIGN = 64
+
+# Source files, relative to the project root
+CONFIG_FILE = "game.ini"
+LAYOUT_FILE = "templates/scene_main.layout"
+TILESET_FILE = "assets/Nice_curses_12x12.png"
+ICON_FILE = "assets/app_icon.png"
+BUNDLE_FILE = "supertrek78.bundle"
+VERIFIED_SUFFIX = ".verified"
+
+# The window icon is shown tiny by every platform, so it is stored downscaled
+ICON_SIZE = (64, 64)
+
+# Entry names inside the bundle
+CONFIG_ENTRY = "config"
+LAYOUT_ENTRY = "layout/scene_main"
+TILESET_ENTRY = "image/tileset"
+ICON_ENTRY = "image/icon"
+SOURCES_ENTRY = "sources"
+
+ROOT_DIR = Path(__file__).resolve().parent
+
+########################################################
+# Class AssetBundle()
+# Read-only, memory-mapped view of a bundle file
+########################################################
+
+
+class AssetBundle:
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            # a truncated file (ex. an interrupted build) must fail like any other invalid bundle
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError(f"[Bundle] Truncated asset bundle: {path}")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        # ask the OS to read the whole file ahead, front to back, instead of faulting it in page by page
+        for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+            if hasattr(mmap, advice):
+                self._map.madvise(getattr(mmap, advice))
+
+        magic, version, _, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"[Bundle] Not an asset bundle: {path}")
+        if version != VERSION:
+            raise ValueError(f"[Bundle] Unsupported bundle version {version} (expected {VERSION}): {path}")
+        if index_offset + index_length > len(self._map):
+            raise ValueError(f"[Bundle] Truncated asset bundle: {path}")
+        self.index: Dict[str, Dict[str, Any]] = json.loads(self._map[index_offset : index_offset + index_length])
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Zero-copy view of an entry's bytes
+    def raw(self, name: str) -> memoryview:
+        entry = self.index[name]
+        return memoryview(self._map)[entry["offset"] : entry["offset"] + entry["length"]]
+
+    def text(self, name: str) -> str:
+        return str(self.raw(name), "utf-8")
+
+    # Surface backed directly by the mapped pixels; convert it before blitting if speed matters
+    def image(self, name: str) -> pygame.Surface:
+        entry = self.index[name]
+        return pygame.image.frombuffer(self.raw(name), (entry["width"], entry["height"]), entry["format"])
+
+    # Compiled layout, with part paths resolved against root the same way ARTemplate does for loose files
+    def layout(self, name: str, root: str) -> Tuple[Dict[str, Any], List[Tuple[int, int, str, List[str]]]]:
+        compiled = json.loads(self.text(name))
+        parts = [(x, y, str(Path(root) / file_path), lines) for x, y, file_path, lines in compiled["parts"]]
+        return compiled["attributes"], parts
+
+    # Source files under root that changed since the bundle was built. Only a file whose size or mtime moved is
+    # hashed, and only until its new mtime has been verified once. Missing files are not stale, so a release
+    # that ships just the bundle still uses it.
+    def stale_sources(self, root: Path) -> List[str]:
+        verified_path = Path(self.path + VERIFIED_SUFFIX)
+        try:
+            verified: Dict[str, List[Any]] = json.loads(verified_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            verified = {}
+
+        stale: List[str] = []
+        newly_verified = False
+        for name, recorded in json.loads(self.text(SOURCES_ENTRY)).items():
+            path = root / name
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_size != recorded["size"]:
+                stale.append(name)
+                continue
+            if stat.st_mtime_ns == recorded["mtime_ns"]:
+                continue
+            seen = [stat.st_size, stat.st_mtime_ns, recorded["blake2b"]]
+            if verified.get(name) == seen:
+                continue
+            if _digest(path) != recorded["blake2b"]:
+                stale.append(name)
+            else:
+                verified[name] = seen
+                newly_verified = True
+
+        # best effort: a read-only install just hashes again next time
+        if newly_verified:
+            try:
+                verified_path.write_text(json.dumps(verified), encoding="utf-8")
+            except OSError:
+                pass
+        return stale
+
+
+########################################################
+# build_bundle()
+########################################################
+
+
+def _digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _sources_entry(root: Path, names: List[str]) -> Tuple[bytes, Dict[str, Any]]:
+    manifest = {}
+    for name in names:
+        stat = (root / name).stat()
+        manifest[name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "blake2b": _digest(root / name)}
+    return json.dumps(manifest).encode("utf-8"), {"kind": "manifest"}
+
+
+def _image_entry(path: Path, size: Optional[Tuple[int, int]] = None) -> Tuple[bytes, Dict[str, Any]]:
+    image = pygame.image.load(str(path))
+    if size is not None:
+        image = pygame.transform.smoothscale(image, size)
+    return pygame.image.tostring(image, "RGBA"), {
+        "kind": "image",
+        "width": image.get_width(),
+        "height": image.get_height(),
+        "format": "RGBA",
+    }
+
+
+def _layout_entry(path: Path, root: Path) -> Tuple[bytes, Dict[str, Any]]:
+    attributes, parts = ARTemplate.parse_scene_template(str(path), str(root))
+    compiled = {
+        "attributes": attributes,
+        "parts": [(x, y, Path(file_path).relative_to(root).as_posix(), lines) for x, y, file_path, lines in parts],
+    }
+    return json.dumps(compiled, ensure_ascii=False).encode("utf-8"), {"kind": "layout"}
+
+
+def build_bundle(root: Path = ROOT_DIR, out: Path = ROOT_DIR / BUNDLE_FILE) -> Dict[str, Dict[str, Any]]:
+    layout, layout_meta = _layout_entry(root / LAYOUT_FILE, root)
+    part_files = [part[2] for part in json.loads(layout)["parts"]]
+    entries: List[Tuple[str, bytes, Dict[str, Any]]] = [
+        (CONFIG_ENTRY, (root / CONFIG_FILE).read_bytes(), {"kind": "config"}),
+        (LAYOUT_ENTRY, layout, layout_meta),
+        (TILESET_ENTRY, *_image_entry(root / TILESET_FILE)),
+        (ICON_ENTRY, *_image_entry(root / ICON_FILE, ICON_SIZE)),
+        (SOURCES_ENTRY, *_sources_entry(root, [CONFIG_FILE, LAYOUT_FILE, TILESET_FILE, ICON_FILE] + part_files)),
+    ]
+
+    index: Dict[str, Dict[str, Any]] = {}
+    data = bytearray()
+    offset = HEADER.size
+    for name, payload, meta in entries:
+        offset += -offset % SECTION_ALIGN
+        data += bytes(offset - HEADER.size - len(data))
+        index[name] = dict(meta, offset=offset, length=len(payload))
+        data += payload
+        offset += len(payload)
+
+    index_bytes = json.dumps(index).encode("utf-8")
+    # verifications recorded against a previous build do not apply to this one
+    Path(str(out) + VERIFIED_SUFFIX).unlink(missing_ok=True)
+    with open(out, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, offset, len(index_bytes)))
+        file.write(data)
+        file.write(index_bytes)
+    return index
+
+
+########################################################
+# main()
+########################################################
+
+
+def main() -> None:
+    out = ROOT_DIR / BUNDLE_FILE
+    index = build_bundle(ROOT_DIR, out)
+    for name, entry in index.items():
+        print(f"[Bundle] {name:<20} {entry['kind']:<8} {entry['length']:>10,} bytes")
+    print(f"[Bundle] Wrote {out} ({out.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
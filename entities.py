@@ -0,0 +1,210 @@
+# entities.py
+# Compact entity model for everything that can sit inside a sector.
+#
+# Type data (max hull, weapon stats, map glyph) is shared through the ENTITY_TYPES flyweight table, and each
+# entity is just an integer ID into a set of packed arrays. Nothing here allocates a Python object per entity,
+# so simulation mode can hold millions of them.
+
+from __future__ import annotations
+from array import array
+from typing import Callable, Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+########################################################
+# Class EntityType()
+# Immutable data shared by every entity of the same kind
+########################################################
+
+
+class EntityType(NamedTuple):
+    name: str
+    glyph: str
+    max_hull: int
+    phaser_power: int
+    torpedoes: int
+    is_static: bool
+
+
+# Type IDs index into ENTITY_TYPES and are stored as a single byte per entity
+SHIP = 0
+KLINGON = 1
+STARBASE = 2
+PLANET = 3
+STAR = 4
+MINE = 5
+PROBE = 6
+SHUTTLE = 7
+
+ENTITY_TYPES: Tuple[EntityType, ...] = (
+    EntityType("ship", ">", 1000, 200, 12, False),
+    EntityType("klingon", "<", 300, 100, 4, False),
+    EntityType("starbase", "B", 2000, 300, 0, True),
+    EntityType("planet", "o", 0, 0, 0, True),
+    EntityType("star", "*", 0, 0, 0, True),
+    EntityType("mine", "+", 50, 0, 0, True),
+    EntityType("probe", "!", 10, 0, 0, False),
+    EntityType("shuttle", "^", 100, 0, 0, False),
+)
+
+# Marks a free slot in the type column
+FREE = 0xFF
+
+########################################################
+# Class EntityStore()
+# Structure-of-arrays storage for all entities in the galaxy
+########################################################
+
+
+class EntityStore:
+    __slots__ = ("sector_count", "type_id", "sector", "x", "y", "hull", "on_remove", "_free", "_buckets")
+
+    # Per-entity column typecodes, plus the typecode of the per-sector ID buckets
+    COLUMNS = {"type_id": "B", "sector": "I", "x": "B", "y": "B", "hull": "H"}
+    INDEX_TYPECODE = "I"
+
+    def __init__(self, sector_count: int) -> None:
+        self.sector_count = sector_count
+        self.type_id = array("B")
+        self.sector = array("I")
+        self.x = array("B")
+        self.y = array("B")
+        self.hull = array("H")
+        # called with the ID of every removed entity, before the ID can be handed out again, so anything keyed
+        # by entity ID (ex. the Klingon planner's actions) can drop what it holds for that entity
+        self.on_remove: List[Callable[[int], None]] = []
+        self._free: List[int] = []
+        # packed IDs for each occupied sector only, kept up to date on every spawn, remove and move, so the
+        # cost of any change is proportional to the sector it touches rather than to the galaxy
+        self._buckets: Dict[int, array[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.type_id) - len(self._free)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Create an entity at full hull and return its ID. Freed IDs are reused before the arrays grow.
+    def spawn(self, type_id: int, sector: int, x: int, y: int) -> int:
+        hull = ENTITY_TYPES[type_id].max_hull
+        if self._free:
+            entity = self._free.pop()
+            self.type_id[entity] = type_id
+            self.sector[entity] = sector
+            self.x[entity] = x
+            self.y[entity] = y
+            self.hull[entity] = hull
+        else:
+            entity = len(self.type_id)
+            self.type_id.append(type_id)
+            self.sector.append(sector)
+            self.x.append(x)
+            self.y.append(y)
+            self.hull.append(hull)
+        self.__bucket_add(sector, entity)
+        return entity
+
+    def remove(self, entity: int) -> None:
+        if self.type_id[entity] == FREE:
+            return
+        self.type_id[entity] = FREE
+        self._free.append(entity)
+        self.__bucket_remove(self.sector[entity], entity)
+        for hook in self.on_remove:
+            hook(entity)
+
+    def move(self, entity: int, sector: int, x: int, y: int) -> None:
+        if self.sector[entity] != sector:
+            self.__bucket_remove(self.sector[entity], entity)
+            self.__bucket_add(sector, entity)
+            self.sector[entity] = sector
+        self.x[entity] = x
+        self.y[entity] = y
+
+    # Apply damage, clamping at zero. Returns True when the entity was destroyed (and removed).
+    def damage(self, entity: int, amount: int) -> bool:
+        hull = self.hull[entity] - amount
+        if hull > 0:
+            self.hull[entity] = hull
+            return False
+        self.hull[entity] = 0
+        self.remove(entity)
+        return True
+
+    def entity_type(self, entity: int) -> EntityType:
+        return ENTITY_TYPES[self.type_id[entity]]
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    def __bucket_add(self, sector: int, entity: int) -> None:
+        bucket = self._buckets.get(sector)
+        if bucket is None:
+            self._buckets[sector] = array(self.INDEX_TYPECODE, [entity])
+        else:
+            bucket.append(entity)
+
+    def __bucket_remove(self, sector: int, entity: int) -> None:
+        bucket = self._buckets[sector]
+        bucket.remove(entity)
+        if not bucket:
+            del self._buckets[sector]
+
+    # Entity IDs in a sector, as the packed bucket itself. Treat it as read-only, and copy it before spawning,
+    # removing or moving entities of that sector while iterating.
+    def in_sector(self, sector: int) -> Sequence[int]:
+        return self._buckets.get(sector, ())
+
+    def occupied_sectors(self) -> List[int]:
+        return list(self._buckets)
+
+    def count_in_sector(self, sector: int, type_id: int) -> int:
+        types = self.type_id
+        return sum(1 for entity in self.in_sector(sector) if types[entity] == type_id)
+
+    def iter_type(self, type_id: int) -> Iterator[int]:
+        types = self.type_id
+        return (entity for entity in range(len(types)) if types[entity] == type_id)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Bytes of packed storage per entity: every column plus its slot in the sector index
+    @classmethod
+    def bytes_per_entity(cls) -> int:
+        columns = sum(array(code).itemsize for code in cls.COLUMNS.values())
+        return columns + array(cls.INDEX_TYPECODE).itemsize
+
+    def memory_report(self) -> Dict[str, int]:
+        column_bytes = sum(getattr(self, name).buffer_info()[1] * getattr(self, name).itemsize for name in self.COLUMNS)
+        index_bytes = sum(len(bucket) * bucket.itemsize for bucket in self._buckets.values())
+        return {
+            "entities": len(self),
+            "slots": len(self.type_id),
+            "bytes_per_entity": self.bytes_per_entity(),
+            "column_bytes": column_bytes,
+            "index_bytes": index_bytes,
+            "total_bytes": column_bytes + index_bytes,
+        }
+
+
+########################################################
+# main()
+# Simulation-mode sizing: python entities.py [count]
+########################################################
+
+
+def main() -> None:
+    import random
+    import sys
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sector_count = 100
+    store = EntityStore(sector_count)
+    rng = random.Random(0)
+    for _ in range(count):
+        store.spawn(rng.randrange(len(ENTITY_TYPES)), rng.randrange(sector_count), rng.randrange(12), rng.randrange(12))
+
+    report = store.memory_report()
+    for key, value in report.items():
+        print(f"[Entities] {key}: {value:,}")
+    print(f"[Entities] measured bytes/entity: {report['total_bytes'] / max(report['entities'], 1):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# klingon_ai.py
+# Turn planner for enemy ships.
+#
+# Every Klingon in a sector is reduced to a small, quantized description of its local situation (own hull,
+# distance to the player, allies nearby, starbase present, player shields and energy). Identical situations
+# always get the same decision, so the scoring is memoized and a whole sector is planned in one pass over the
+# packed entity columns. Off-screen sectors are planned round-robin under a fixed per-turn entity budget.
+
+from __future__ import annotations
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from entities import ENTITY_TYPES, KLINGON, STARBASE, EntityStore
+
+# Actions, stored as one byte per entity in KlingonPlanner.actions
+MOVE = 0
+FIRE = 1
+FLEE = 2
+CALL_REINFORCEMENTS = 3
+IDLE = 0xFF
+
+ACTION_NAMES: Dict[int, str] = {
+    MOVE: "move",
+    FIRE: "fire",
+    FLEE: "flee",
+    CALL_REINFORCEMENTS: "call reinforcements",
+    IDLE: "idle",
+}
+
+# Quantization thresholds. The shield and energy steps match the percent/units used in game.ini.
+HULL_STEPS = (25, 50, 75)
+DISTANCE_STEPS = (2, 4, 7)
+SHIELD_STEPS = (25, 50, 75)
+ENERGY_STEPS = (250, 500, 750)
+ALLY_STEPS = (1, 3)
+
+# Distance bucket used when the player is not in the sector
+DISTANCE_ABSENT = len(DISTANCE_STEPS) + 1
+
+# Bounds the memo table; the situation space is far smaller than this
+DECISION_CACHE_SIZE = 4096
+
+Situation = Tuple[int, int, int, int, int, bool]
+
+########################################################
+# Helpers
+########################################################
+
+
+def _bucket(value: int, steps: Tuple[int, ...]) -> int:
+    for i, step in enumerate(steps):
+        if value < step:
+            return i
+    return len(steps)
+
+
+# Score each action for a situation and return the best one. Ties resolve to the lowest action ID.
+@lru_cache(maxsize=DECISION_CACHE_SIZE)
+def decide(situation: Situation) -> int:
+    hull, distance, shields, energy, allies, starbase = situation
+    # 0 = player nearly spent, 3 = player at full strength
+    player_strength = (shields + energy) / 2
+
+    scores = [0.0] * 4
+    if distance != DISTANCE_ABSENT:
+        # how the fight looks from this Klingon's side: positive when it and its allies outclass the player
+        advantage = hull + allies - player_strength
+        scores[FIRE] = 1.5 + advantage - distance * 1.5
+        scores[MOVE] = 0.5 + distance * 0.5 + advantage * 0.5
+        scores[FLEE] = (1 - hull) * 2.0 + player_strength * 0.5 - allies
+        # outmatched but still able to hold on: ask for help rather than run
+        scores[CALL_REINFORCEMENTS] = 1.0 - advantage - allies - (0.0 if hull else 1.5)
+    else:
+        # no player in sight: besiege a starbase if there is one, calling for help when weak, otherwise patrol
+        scores[FIRE] = hull + 0.5 if starbase else -1.0
+        scores[MOVE] = 1.0
+        scores[FLEE] = (1 - hull) * 2.0 - allies
+        scores[CALL_REINFORCEMENTS] = 2.5 - allies - hull * 0.5 if starbase else -1.0
+
+    best = MOVE
+    for action in (FIRE, FLEE, CALL_REINFORCEMENTS):
+        if scores[action] > scores[best]:
+            best = action
+    return best
+
+
+########################################################
+# Class KlingonPlanner()
+########################################################
+
+
+class KlingonPlanner:
+
+    def __init__(self, entities: EntityStore, max_entities_per_turn: int = 4096) -> None:
+        self.entities = entities
+        self.max_entities_per_turn = max_entities_per_turn
+        # last decision per entity ID, IDLE for anything not yet planned
+        self.actions = array("B")
+        # round-robin position: off-screen sector index and Klingon offset within it, plus the Klingon offset
+        # within the visible sector when it is too crowded to plan in one turn
+        self._cursor = 0
+        self._offset = 0
+        self._current_sector = -1
+        self._current_offset = 0
+        # a removed entity's ID is reused by the next spawn, so its plan must not outlive it
+        entities.on_remove.append(self.__forget)
+
+    def __forget(self, entity: int) -> None:
+        if entity < len(self.actions):
+            self.actions[entity] = IDLE
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Plan every Klingon in one sector in a single pass. Returns the number of Klingons planned.
+    def plan_sector(
+        self,
+        sector: int,
+        player_position: Optional[Tuple[int, int]],
+        player_shields: int,
+        player_energy: int,
+    ) -> int:
+        return self.__plan(sector, player_position, player_shields, player_energy, 0, len(self.entities.type_id))[0]
+
+    # Plan at most limit Klingons of a sector, starting at its start-th Klingon. Returns the number planned and
+    # whether the sector's last Klingon was reached.
+    def __plan(
+        self,
+        sector: int,
+        player_position: Optional[Tuple[int, int]],
+        player_shields: int,
+        player_energy: int,
+        start: int,
+        limit: int,
+    ) -> Tuple[int, bool]:
+        store = self.entities
+        ids = store.in_sector(sector)
+        if len(self.actions) < len(store.type_id):
+            self.actions.extend([IDLE] * (len(store.type_id) - len(self.actions)))
+
+        # one pass to gather the sector-wide features
+        types = store.type_id
+        klingons: List[int] = []
+        starbase = False
+        for entity in ids:
+            kind = types[entity]
+            if kind == KLINGON:
+                klingons.append(entity)
+            elif kind == STARBASE:
+                starbase = True
+        batch = klingons[start : start + limit]
+        if not batch:
+            return 0, True
+
+        shields = _bucket(player_shields, SHIELD_STEPS)
+        energy = _bucket(player_energy, ENERGY_STEPS)
+        allies = _bucket(len(klingons) - 1, ALLY_STEPS)
+        max_hull = ENTITY_TYPES[KLINGON].max_hull
+        hull_col, x_col, y_col = store.hull, store.x, store.y
+
+        for entity in batch:
+            hull = _bucket(hull_col[entity] * 100 // max_hull, HULL_STEPS)
+            if player_position is None:
+                distance = DISTANCE_ABSENT
+            else:
+                px, py = player_position
+                distance = _bucket(max(abs(x_col[entity] - px), abs(y_col[entity] - py)), DISTANCE_STEPS)
+            self.actions[entity] = decide((hull, distance, shields, energy, allies, starbase))
+        return len(batch), start + len(batch) >= len(klingons)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Plan the visible sector first, then continue round-robin through the off-screen sectors. The budget is
+    # counted per Klingon and is a hard cap: a sector larger than what is left is planned in slices over several
+    # turns, resuming where the previous turn stopped. Klingons not reached this turn keep their previous plan.
+    def plan_turn(
+        self,
+        current_sector: int,
+        player_position: Tuple[int, int],
+        player_shields: int,
+        player_energy: int,
+        offscreen_sectors: Optional[Iterable[int]] = None,
+    ) -> int:
+        budget = self.max_entities_per_turn
+        if current_sector != self._current_sector:
+            self._current_sector, self._current_offset = current_sector, 0
+        planned, done = self.__plan(
+            current_sector, player_position, player_shields, player_energy, self._current_offset, budget
+        )
+        self._current_offset = 0 if done else self._current_offset + planned
+
+        sectors = self.entities.occupied_sectors() if offscreen_sectors is None else list(offscreen_sectors)
+        sectors = [sector for sector in sectors if sector != current_sector]
+        if not sectors:
+            return planned
+        start = self._cursor % len(sectors)
+        for i in range(len(sectors)):
+            position = (start + i) % len(sectors)
+            if planned >= budget:
+                self._cursor = position
+                return planned
+            count, done = self.__plan(
+                sectors[position], None, player_shields, player_energy, self._offset, budget - planned
+            )
+            planned += count
+            if not done:
+                self._cursor = position
+                self._offset += count
+                return planned
+            self._offset = 0
+        self._cursor = start
+        return planned
+
+    # Plans are cleared when their entity is removed, so an ID reused since its last plan reports IDLE until it
+    # is planned again; the type check covers IDs that are free right now.
+    def action(self, entity: int) -> int:
+        if entity >= len(self.actions) or self.entities.type_id[entity] != KLINGON:
+            return IDLE
+        return self.actions[entity]
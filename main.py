@@ -4,27 +4,74 @@
 # https://www.youtube.com/watch?v=AY9MnQ4x3zk&t=306s
 # best ascii tile repositories: https://dwarffortresswiki.org/Tileset_repository#16x16_sb_ascii.png
 
+import time
+import random
 import pygame
 import configparser
 from sys import exit
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
-from ascii_rend import ARDraw, ARTemplate
-
-GALAXY_WIDTH = 10
-GALAXY_HEIGHT = 10
-
-########################################################
-# Class Sector()
-########################################################
-
-
-@dataclass
-class Sector:
-    starbases: int = 0
-    enemies: int = 0
-    planets: int = 0
-
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from ascii_rend import ARDraw, ARTemplate, ARWatcher
+from bundle import (
+    AssetBundle,
+    ROOT_DIR,
+    BUNDLE_FILE,
+    CONFIG_FILE,
+    LAYOUT_FILE,
+    TILESET_FILE,
+    ICON_FILE,
+    CONFIG_ENTRY,
+    LAYOUT_ENTRY,
+    TILESET_ENTRY,
+    ICON_ENTRY,
+)
+from entities import ENTITY_TYPES, KLINGON, SHIP, EntityStore
+from klingon_ai import FIRE, KlingonPlanner
+from simulation import FULL, SECTOR_SIZE, GalaxySimulation
+from subsystems import (
+    ShipSystems,
+    ENERGY,
+    MAX_ENERGY,
+    SHIELDS,
+    CLOAK_ON,
+    WARP_FACTOR,
+    CLOAK,
+    WARP_DRIVE,
+    COMPUTER,
+    LIFE_SUPPORT,
+    SUBSPACE_RADIO,
+)
+
+# Paths are resolved against the project directory, not the working directory
+CONFIG_PATH = str(ROOT_DIR / CONFIG_FILE)
+LAYOUT_PATH = str(ROOT_DIR / LAYOUT_FILE)
+TILESET_PATH = str(ROOT_DIR / TILESET_FILE)
+ICON_PATH = str(ROOT_DIR / ICON_FILE)
+BUNDLE_PATH = str(ROOT_DIR / BUNDLE_FILE)
+
+# Share of a Klingon's phaser power that reaches the ship per shot, scaled by the Klingon's remaining hull
+KLINGON_FIRE_DIVISOR = 4
+
+# Impulse keys, laid out around the ship as on the weapons panel: key -> (dx, dy)
+IMPULSE_KEYS = {
+    pygame.K_q: (-1, -1),
+    pygame.K_w: (0, -1),
+    pygame.K_e: (1, -1),
+    pygame.K_a: (-1, 0),
+    pygame.K_d: (1, 0),
+    pygame.K_z: (-1, 1),
+    pygame.K_x: (0, 1),
+    pygame.K_c: (1, 1),
+}
+
+# Reloading a single edited part should fit inside one 60 fps frame
+FRAME_BUDGET_MS = 1000 / 60
+
+# Template parts that frame a panel; the panel draws its live values into the part's {{field}} gaps
+GAME_STATUS_PART = str(ROOT_DIR / "templates/parts/game_status.txt")
+GALAXY_MAP_PART = str(ROOT_DIR / "templates/parts/galaxy_map.txt")
+SHIP_STATUS_PART = str(ROOT_DIR / "templates/parts/ship_status.txt")
+SECTOR_MAP_PART = str(ROOT_DIR / "templates/parts/sector_map.txt")
 
 ########################################################
 # Class GameState()
@@ -32,21 +79,78 @@ class Sector:
 
 
 class GameState:
-    def __init__(self, galaxy_width: int, galaxy_height: int) -> None:
+    def __init__(
+        self, galaxy_width: int, galaxy_height: int, seed: int = 0, coarse_sectors_per_turn: int = 256
+    ) -> None:
         self.current_sector: Tuple[int, int] = (0, 0)
         self.player_position: Tuple[int, int] = (5, 5)
         self.klingons_remaining: int = 3
         self.star_date: int = 0
         self.time_left: int = 0
-        self.energy: int = 1000
-        self.shields: int = 500
+        self.systems: ShipSystems = ShipSystems()
         self.galaxy_width: int = galaxy_width
         self.galaxy_height: int = galaxy_height
-        self.sectors: List[List[Sector]] = self.init_sectors()
+        self.entities: EntityStore = EntityStore(galaxy_width * galaxy_height)
+        self.klingon_ai: KlingonPlanner = KlingonPlanner(self.entities)
+        self.simulation: GalaxySimulation = GalaxySimulation(
+            galaxy_width, galaxy_height, self.entities, seed, coarse_sectors_per_turn
+        )
+        self.starbases: int = 3
         self.game_over: bool = True
-
-    def init_sectors(self) -> List[List[Sector]]:
-        return [[Sector() for _ in range(self.galaxy_width)] for _ in range(self.galaxy_height)]
+        self.rng: random.Random = random.Random(seed)
+        # raw [gameplay] values last loaded, so a reload only applies the keys that were edited
+        self.gameplay: Dict[str, str] = {}
+
+    # Apply the [gameplay] keys present in the section, keeping current values for the rest. Every value is
+    # parsed before anything is assigned, so a bad value raises ValueError and leaves the state untouched.
+    def apply_gameplay(self, gameplay: configparser.SectionProxy) -> None:
+        star_date = gameplay.getint("star_date", fallback=self.star_date)
+        time_left = gameplay.getint("time_left", fallback=self.time_left)
+        klingons_remaining = gameplay.getint("klingons", fallback=self.klingons_remaining)
+        starbases = gameplay.getint("starbases", fallback=self.starbases)
+        self.systems.apply_gameplay(gameplay)
+        self.star_date = star_date
+        self.time_left = time_left
+        self.klingons_remaining = klingons_remaining
+        self.starbases = starbases
+
+    # Apply only the [gameplay] keys whose raw value changed since the last load, so saving game.ini mid-game does
+    # not refill energy or reset damage that the edit did not touch. On a bad value nothing is applied and the
+    # next load diffs against the same, last good values.
+    def load_gameplay(self, gameplay: Dict[str, str]) -> None:
+        changed = {key: value for key, value in gameplay.items() if self.gameplay.get(key) != value}
+        if changed:
+            delta = configparser.ConfigParser(interpolation=None)
+            delta.read_dict({"gameplay": changed})
+            self.apply_gameplay(delta["gameplay"])
+        self.gameplay = dict(gameplay)
+
+    # Distribute the starting Klingons and starbases, then bring the player's neighbourhood to full detail
+    def populate_galaxy(self) -> None:
+        self.simulation.populate(self.klingons_remaining, self.starbases)
+        self.simulation.focus(self.sector_index(self.current_sector))
+
+    # Energy and shields are stored in the subsystem model so the status panel sees every change
+    @property
+    def energy(self) -> int:
+        return self.systems.get(ENERGY)
+
+    @energy.setter
+    def energy(self, value: int) -> None:
+        self.systems.set(ENERGY, value)
+
+    @property
+    def shields(self) -> int:
+        return self.systems.get(SHIELDS)
+
+    @shields.setter
+    def shields(self, value: int) -> None:
+        self.systems.set(SHIELDS, value)
+
+    # Flat sector index used by the entity arrays
+    def sector_index(self, sector: Tuple[int, int]) -> int:
+        x, y = sector
+        return y * self.galaxy_width + x
 
     def reset(self) -> None:
         self.__init__()  # Simple reset
@@ -59,6 +163,51 @@ class GameState:
         x, y = self.player_position
         self.player_position = (x + dx, y + dy)
 
+    # Arriving in a sector promotes it and its neighbours to full detail
+    def enter_sector(self, sector: Tuple[int, int]) -> None:
+        self.current_sector = sector
+        self.simulation.focus(self.sector_index(sector))
+
+    # Move the ship one cell and end the turn. Crossing the sector edge enters the neighbouring sector; the
+    # galaxy edge blocks the move and no turn passes.
+    def impulse(self, dx: int, dy: int) -> None:
+        x, y = self.player_position[0] + dx, self.player_position[1] + dy
+        sx, sy = self.current_sector
+        sx, x = sx + x // SECTOR_SIZE, x % SECTOR_SIZE
+        sy, y = sy + y // SECTOR_SIZE, y % SECTOR_SIZE
+        if not (0 <= sx < self.galaxy_width and 0 <= sy < self.galaxy_height):
+            return
+        if (sx, sy) != self.current_sector:
+            self.enter_sector((sx, sy))
+        self.player_position = (x, y)
+        self.end_turn()
+
+    # Every Klingon in the player's sector that planned to fire last turn hits the ship
+    def resolve_enemy_fire(self) -> None:
+        store = self.entities
+        klingon = ENTITY_TYPES[KLINGON]
+        for entity in store.in_sector(self.sector_index(self.current_sector)):
+            if self.klingon_ai.action(entity) == FIRE:
+                amount = klingon.phaser_power * store.hull[entity] // klingon.max_hull // KLINGON_FIRE_DIVISOR
+                self.systems.take_hit(amount, self.rng)
+
+    # Resolve enemy fire, run ship upkeep and repairs, advance the off-screen galaxy, then let every full-detail
+    # enemy pick its action for the coming turn
+    def end_turn(self) -> None:
+        self.resolve_enemy_fire()
+        self.systems.end_turn()
+        if self.energy == 0:
+            self.game_over = True
+        self.simulation.step()
+        self.klingon_ai.plan_turn(
+            self.sector_index(self.current_sector),
+            self.player_position,
+            self.shields,
+            self.energy,
+            self.simulation.full_sectors(),
+        )
+        self.klingons_remaining = self.simulation.klingon_count()
+
     def consume_energy(self, amount: int) -> None:
         self.energy = max(0, self.energy - amount)
         if self.energy == 0:
@@ -66,62 +215,75 @@ class GameState:
 
 
 ########################################################
-# Class StatusDisplay()
-# Represents the status of the game
+# Class TemplatePanel()
+# Base for the panels framed by a template part
 ########################################################
 
 
-class StatusDisplay:
+# The part is rendered into a cached layer like every other part; the panel only draws its live values into the
+# part's {{field}} gaps, which are found again whenever the part is rebuilt
+class TemplatePanel:
 
-    def __init__(self, start_row: int, state: GameState, renderer: ARDraw):
-        self.start_row = start_row
+    def __init__(self, state: GameState, renderer: ARDraw):
         self.state = state
         self.renderer = renderer
-
-    # Placeholder for drawing the map on the screen
-    def draw(self, screen: pygame.Surface):
-        self.renderer.draw_text(
-            screen,
-            "╔══════════════════════════════════════ SUPER TREK 78 ═════════════════════════════════════════╗",
-            1,
-            self.start_row,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+        self.start_col = 0
+        self.start_row = 0
+        self.width = 0
+        self.height = 0
+        self.fields: Dict[str, List[Tuple[int, int, int]]] = {}
+
+    # Take the placement, size and fields of a freshly built part. A part dropped from the layout is passed on
+    # with no lines and no fields, so the panel draws nothing until it comes back.
+    def set_template(
+        self, start_col: int, start_row: int, lines: List[str], fields: Dict[str, List[Tuple[int, int, int]]]
+    ) -> None:
+        self.start_col = start_col
+        self.start_row = start_row
+        self.width = max((len(line) for line in lines), default=0)
+        self.height = len(lines)
+        self.fields = fields
+
+    # Draw text into a field of the part, cut or padded to the field's width
+    def draw_field(
+        self,
+        screen: pygame.Surface,
+        col: int,
+        row: int,
+        width: int,
+        text: str,
+        fg: Optional[Tuple[int, int, int]] = None,
+    ) -> None:
         self.renderer.draw_text(
             screen,
-            "║                                                                                              ║",
-            1,
-            self.start_row + 1,
-            self.renderer.COLOR_FG1,
+            f"{text[:width]:<{width}}",
+            self.start_col + col,
+            self.start_row + row,
+            fg or self.renderer.COLOR_FG1,
             self.renderer.COLOR_BG,
         )
 
-        star_date: str = "░░░░░░░"
-        time_left: str = "░░░"
-        klingons: str = "░░"
-        if self.state.is_game_over() != True:
-            star_date = self.renderer.padded_string(self.state.star_date, 7, " ", False)
-            time_left = self.renderer.padded_string(self.state.time_left, 3, " ", False)
-            klingons = self.renderer.padded_string(self.state.klingons_remaining, 2, " ", False)
 
-        self.renderer.draw_text(
-            screen,
-            f"║       Star date: {star_date}             Time left: {time_left} days             Klingons: {klingons}            ║",
-            1,
-            self.start_row + 2,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+########################################################
+# Class StatusDisplay()
+# Represents the status of the game
+########################################################
 
-        self.renderer.draw_text(
-            screen,
-            "║                                                                                              ║",
-            1,
-            self.start_row + 3,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+
+class StatusDisplay(TemplatePanel):
+
+    def draw(self, screen: pygame.Surface):
+        values = {
+            "star_date": self.state.star_date,
+            "time_left": self.state.time_left,
+            "klingons": self.state.klingons_remaining,
+        }
+        for name, value in values.items():
+            for col, row, width in self.fields.get(name, []):
+                text = "░" * width
+                if self.state.is_game_over() != True:
+                    text = self.renderer.padded_string(value, width, " ", False)
+                self.draw_field(screen, col, row, width, text)
 
 
 ########################################################
@@ -130,88 +292,68 @@ class StatusDisplay:
 ########################################################
 
 
-class GalaxyMap:
+class GalaxyMap(TemplatePanel):
+    # The map shows a window of the galaxy around the current sector, so drawing cost does not depend on its size
+    VIEW_WIDTH = 10
+    VIEW_HEIGHT = 10
+    # Layout of a galaxy_row field: the row number, then one cell per sector
+    LABEL_WIDTH = 4
+    CELL_OFFSET = 6
+    CELL_PITCH = 9
+    CELL_WIDTH = 5
 
-    def __init__(self, start_row: int, galaxy_width: int, galaxy_height: int, state: GameState, renderer: ARDraw):
-        self.start_row = start_row
+    def __init__(self, galaxy_width: int, galaxy_height: int, state: GameState, renderer: ARDraw):
+        super().__init__(state, renderer)
         self.galaxy_width = galaxy_width
         self.galaxy_height = galaxy_height
-        self.state = state
-        self.renderer = renderer
 
     # Placeholder for map generation logic
     def generate_map(self):
         pass
 
-    # Draw a single sector in the map
-    def __draw_sector(self, screen: pygame.Surface, start_row: int, start_col: int, sector: Sector):
+    # Top-left sector of the viewport, centred on the current sector and clipped to the galaxy edge
+    def __viewport_origin(self) -> Tuple[int, int]:
+        cx, cy = self.state.current_sector
+        ox = min(max(0, cx - self.VIEW_WIDTH // 2), max(0, self.galaxy_width - self.VIEW_WIDTH))
+        oy = min(max(0, cy - self.VIEW_HEIGHT // 2), max(0, self.galaxy_height - self.VIEW_HEIGHT))
+        return ox, oy
+
+    # Draw a single sector in the map. Sectors within sensor range (full detail) show enemies·starbases·planets.
+    def __draw_sector(self, screen: pygame.Surface, start_row: int, start_col: int, sector: int):
+        text = "░░░░░"
+        simulation = self.state.simulation
+        if simulation.tier[sector] == FULL:
+            enemies, starbases, planets = simulation.sector_summary(sector)
+            text = f"{min(enemies, 9)}·{min(starbases, 9)}·{min(planets, 9)}"
         self.renderer.draw_text(
             screen,
-            "░░░░░",
+            text,
             start_col,
             start_row,
             self.renderer.COLOR_FG1,
             self.renderer.COLOR_BG,
         )
 
-    # Placeholder for drawing the map on the screen
-    # We use "start_row" to keep track of which row we are drawing
     def draw(self, screen: pygame.Surface):
-        self.renderer.draw_text(
-            screen,
-            "╠═══════════════════════════════════════ Galaxy [M]ap ═════════════════════════════════════════╣",
-            1,
-            self.start_row,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+        ox, oy = self.__viewport_origin()
+        view_width = min(self.VIEW_WIDTH, self.galaxy_width)
+        view_height = min(self.VIEW_HEIGHT, self.galaxy_height)
 
-        self.renderer.draw_text(
-            screen,
-            "║        1        2        3        4        5        6        7        8        9       10    ║",
-            1,
-            self.start_row + 1,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+        columns = "".join(f"{ox + x + 1:>{self.CELL_PITCH}}" for x in range(view_width))
+        for col, row, width in self.fields.get("galaxy_columns", []):
+            self.draw_field(screen, col, row, width, columns)
 
-        # Iterate through the sectors, one row at a time. y = row number
-        for y in range(self.state.galaxy_height):
-            if y + 1 < 10:
-                # right justify numbers less than 10
-                self.renderer.draw_text(
-                    screen,
-                    f"║   {y+1}                                                                                          ║",
-                    1,
-                    self.start_row + y + 2,
-                    self.renderer.COLOR_FG1,
-                    self.renderer.COLOR_BG,
-                )
-            else:
-                self.renderer.draw_text(
-                    screen,
-                    f"║  {y+1}                                                                                          ║",
-                    1,
-                    self.start_row + y + 2,
-                    self.renderer.COLOR_FG1,
-                    self.renderer.COLOR_BG,
-                )
-
-            # Within the row, draw the state of each sector
-            row = self.start_row + y + 2
-            for x in range(self.state.galaxy_width):
-                sector = self.state.sectors[y][x]
-                col = 8 + (x * 9)
-                self.__draw_sector(screen, row, col, sector)
+        # One viewport row per galaxy_row field, top to bottom; fields past the galaxy edge stay blank.
+        # y = row number within the viewport
+        for y, (col, row, width) in enumerate(self.fields.get("galaxy_row", [])[:view_height]):
+            self.draw_field(screen, col, row, width, f"{oy + y + 1:>{self.LABEL_WIDTH}}")
 
-        self.renderer.draw_text(
-            screen,
-            "╚══════════════════════════════════════════════════════════════════════════════════════════════╝",
-            1,
-            self.start_row + 11,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+            # Within the row, draw the state of each sector that fits in the field
+            for x in range(view_width):
+                offset = self.CELL_OFFSET + x * self.CELL_PITCH
+                if offset + self.CELL_WIDTH <= width:
+                    sector = self.state.sector_index((ox + x, oy + y))
+                    self.__draw_sector(screen, self.start_row + row, self.start_col + col + offset, sector)
 
 
 ########################################################
@@ -219,103 +361,85 @@ class GalaxyMap:
 ########################################################
 
 
-# Represents the status of the game
-class ShipStatus:
+# Represents the status of the ship. Each gauge is drawn into a cached overlay of the part and only redrawn when
+# one of the subsystem fields it shows appears in the change set, or when the part has been rebuilt.
+class ShipStatus(TemplatePanel):
+
+    def __init__(self, state: GameState, renderer: ARDraw):
+        super().__init__(state, renderer)
+        self.layer = pygame.Surface((0, 0), pygame.SRCALPHA)
+        self.redraw = True
+        self.condition_colors = {
+            "[RED]": renderer.COLOR_RED,
+            "[YELLOW]": renderer.COLOR_YELLOW,
+            "[GREEN]": renderer.COLOR_GREEN,
+        }
+
+        # field name in the part -> (subsystem fields shown in it, function formatting it to the field width)
+        self.gauges: Dict[str, Tuple[Set[int], Callable[[int], str]]] = {
+            "condition": ({ENERGY, MAX_ENERGY, SHIELDS}, self.__condition),
+            "energy": ({ENERGY}, lambda width: f"{self.state.energy:,} units"),
+            "energy_bar": ({ENERGY, MAX_ENERGY}, self.__energy_bar),
+            "shields": ({SHIELDS}, lambda width: f"<{self.state.shields}%>"),
+            "shield_bar": ({SHIELDS}, self.__shield_bar),
+            "cloak": ({CLOAK_ON, CLOAK}, self.__cloak),
+            "warp_drive": ({WARP_FACTOR, WARP_DRIVE}, self.__warp_drive),
+            "computer": ({COMPUTER}, lambda width: f"<{self.__integrity(COMPUTER)}%>"),
+            "life_support": ({LIFE_SUPPORT}, lambda width: f"<{self.__integrity(LIFE_SUPPORT)}%>"),
+            "subspace_radio": ({SUBSPACE_RADIO}, lambda width: f"<{self.__integrity(SUBSPACE_RADIO)}%>"),
+        }
+
+    def set_template(
+        self, start_col: int, start_row: int, lines: List[str], fields: Dict[str, List[Tuple[int, int, int]]]
+    ) -> None:
+        super().set_template(start_col, start_row, lines, fields)
+        size = self.renderer.tile_size
+        self.layer = pygame.Surface((self.width * size, self.height * size), pygame.SRCALPHA)
+        self.redraw = True
+
+    def __integrity(self, field: int) -> int:
+        return self.state.systems.get(field)
+
+    def __condition(self, width: int) -> str:
+        systems = self.state.systems
+        if self.state.energy < systems.max_energy // 10 or self.state.shields < 25:
+            return "[RED]"
+        if self.state.energy < systems.max_energy // 4 or self.state.shields < 50:
+            return "[YELLOW]"
+        return "[GREEN]"
+
+    def __energy_bar(self, width: int) -> str:
+        max_energy = max(self.state.systems.max_energy, 1)
+        return "|" * (width * self.state.energy // max_energy)
+
+    def __shield_bar(self, width: int) -> str:
+        return "|" * (width * self.state.shields // 100)
+
+    def __cloak(self, width: int) -> str:
+        status = "ON" if self.state.systems.get(CLOAK_ON) else "OFF"
+        return f"[{status}] <{self.__integrity(CLOAK)}%>"
+
+    def __warp_drive(self, width: int) -> str:
+        return f"{self.state.systems.get(WARP_FACTOR)}  <{self.__integrity(WARP_DRIVE)}%>"
+
+    # Clear one field in the overlay, letting the part show through, and draw its new text
+    def __render_field(self, col: int, row: int, width: int, text: str) -> None:
+        size = self.renderer.tile_size
+        self.layer.fill((0, 0, 0, 0), pygame.Rect(col * size, row * size, width * size, size))
+        color = self.condition_colors.get(text, self.renderer.COLOR_FG1)
+        self.renderer.draw_text(self.layer, text[:width], col, row, color, self.renderer.COLOR_BG)
 
-    def __init__(self, start_row: int, state: GameState, renderer: ARDraw):
-        self.start_row = start_row
-        self.state = state
-        self.renderer = renderer
-
-    # Placeholder for drawing the map on the screen
     def draw(self, screen: pygame.Surface):
-        self.renderer.draw_text(
-            screen,
-            "Condition: [Green]",
-            1,
-            self.start_row,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+        changes = self.state.systems.take_changes()
+        if changes or self.redraw:
+            for name, (fields, format_value) in self.gauges.items():
+                if self.redraw or fields & changes:
+                    for col, row, width in self.fields.get(name, []):
+                        self.__render_field(col, row, width, format_value(width))
+            self.redraw = False
 
-        self.renderer.draw_text(
-            screen,
-            "Energy: 1,000 Units",
-            1,
-            self.start_row + 2,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-        self.renderer.draw_text(
-            screen,
-            "||||||||||||||||||||",
-            1,
-            self.start_row + 3,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        self.renderer.draw_text(
-            screen,
-            "Shields: <84%>",
-            1,
-            self.start_row + 5,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-        self.renderer.draw_text(
-            screen,
-            "F:|||| A:|||| P:|||| S:||||",
-            1,
-            self.start_row + 6,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        self.renderer.draw_text(
-            screen,
-            "[C]loak: [OFF] <100%>",
-            1,
-            self.start_row + 8,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        self.renderer.draw_text(
-            screen,
-            "[W]arp drive: 5  <100%>",
-            1,
-            self.start_row + 10,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        self.renderer.draw_text(
-            screen,
-            "Computer: <100%>",
-            1,
-            self.start_row + 12,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        self.renderer.draw_text(
-            screen,
-            "Life support: <100%>",
-            1,
-            self.start_row + 13,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        self.renderer.draw_text(
-            screen,
-            "Subspace radio: <100%>",
-            1,
-            self.start_row + 14,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+        size = self.renderer.tile_size
+        screen.blit(self.layer, (self.start_col * size, self.start_row * size))
 
 
 ########################################################
@@ -324,73 +448,25 @@ class ShipStatus:
 ########################################################
 
 
-class SectorMap:
+# Draws the current sector's grid into the sector_map part, one sector_row field per row of the sector, with one
+# glyph per cell taken from the entity type table
+class SectorMap(TemplatePanel):
+    CELL_WIDTH = 3
 
-    def __init__(self, start_row: int, state: GameState, renderer: ARDraw):
-        self.start_row = start_row
-        self.state = state
-        self.renderer = renderer
+    # Glyph per cell of the current sector, with the player's ship on top
+    def __cells(self) -> List[List[str]]:
+        cells = [["."] * SECTOR_SIZE for _ in range(SECTOR_SIZE)]
+        store = self.state.entities
+        for entity in store.in_sector(self.state.sector_index(self.state.current_sector)):
+            cells[store.y[entity]][store.x[entity]] = store.entity_type(entity).glyph
+        px, py = self.state.player_position
+        if 0 <= px < SECTOR_SIZE and 0 <= py < SECTOR_SIZE:
+            cells[py][px] = ENTITY_TYPES[SHIP].glyph
+        return cells
 
-    # Draw a single sector in the map
-    def __draw_location(self, screen: pygame.Surface, start_row: int, start_col: int):
-        self.renderer.draw_text(
-            screen,
-            "░░░░░",
-            start_col,
-            start_row,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-    # Placeholder for drawing the map on the screen
-    # We use "start_row" to keep track of which row we are drawing
     def draw(self, screen: pygame.Surface):
-        self.renderer.draw_text(
-            screen,
-            "   1   2   3   4   5   6   7   8   9  10",
-            29,
-            self.start_row,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
-
-        # Iterate through the sectors, one row at a time. y = row number
-        for y in range(self.state.galaxy_height):
-            if y + 1 < 10:
-                # right justify numbers less than 10
-                self.renderer.draw_text(
-                    screen,
-                    f"║   {y+1}                                                                                          ║",
-                    1,
-                    self.start_row + y + 2,
-                    self.renderer.COLOR_FG1,
-                    self.renderer.COLOR_BG,
-                )
-            else:
-                self.renderer.draw_text(
-                    screen,
-                    f"║  {y+1}                                                                                          ║",
-                    1,
-                    self.start_row + y + 2,
-                    self.renderer.COLOR_FG1,
-                    self.renderer.COLOR_BG,
-                )
-
-            # Within the row, draw the state of each sector
-            row = self.start_row + y + 2
-            for x in range(self.state.galaxy_width):
-                sector = self.state.sectors[y][x]
-                col = 8 + (x * 9)
-                # self.__draw_sector(screen, row, col, sector)
-
-        self.renderer.draw_text(
-            screen,
-            "╚══════════════════════════════════════════════════════════════════════════════════════════════╝",
-            1,
-            self.start_row + 11,
-            self.renderer.COLOR_FG1,
-            self.renderer.COLOR_BG,
-        )
+        for (col, row, width), cells in zip(self.fields.get("sector_row", []), self.__cells()):
+            self.draw_field(screen, col, row, width, "".join(cell.ljust(self.CELL_WIDTH) for cell in cells))
 
 
 ########################################################
@@ -404,32 +480,153 @@ class SuperTrek78:
 
     def __init__(self):
         pygame.init()
+
+        # a built bundle (python make.py bundle) replaces the loose asset files; without a current one, load
+        # those directly and watch them for changes
+        self.bundle: Optional[AssetBundle] = self.__open_bundle()
+
         pygame.display.set_caption("Super Trek 78")
-        pygame.display.set_icon(pygame.image.load("assets/app_icon.png"))
+        pygame.display.set_icon(self.bundle.image(ICON_ENTRY) if self.bundle else pygame.image.load(ICON_PATH))
 
         # load game config
-        config = configparser.ConfigParser()
-        config.read("game.ini")
+        config = self.__read_config()
 
         self.galaxy_width = config.getint("scene", "galaxy_width")
         self.galaxy_height = config.getint("scene", "galaxy_height")
 
         # load templates
-        self.scene_attributes, self.scene_templates = ARTemplate.parse_scene_template("templates/scene_main.layout")
-        self.tile_size = self.scene_attributes.get("tile_size")
-        self.screen_width_px = self.tile_size * self.scene_attributes.get("scene_width")
-        self.screen_height_px = self.tile_size * self.scene_attributes.get("scene_height")
+        if self.bundle:
+            self.scene_attributes, self.scene_templates = self.bundle.layout(LAYOUT_ENTRY, str(ROOT_DIR))
+        else:
+            self.scene_attributes, self.scene_templates = ARTemplate.parse_scene_template(LAYOUT_PATH, str(ROOT_DIR))
+        # front matter values are untyped, so resolve the screen geometry to ints once here
+        self.tile_size: int = int(self.scene_attributes["tile_size"])
+        self.screen_width_px = self.tile_size * int(self.scene_attributes["scene_width"])
+        self.screen_height_px = self.tile_size * int(self.scene_attributes["scene_height"])
 
         self.screen = pygame.display.set_mode((self.screen_width_px, self.screen_height_px))
-        self.game_state = GameState(GALAXY_WIDTH, GALAXY_HEIGHT)
-        self.renderer = ARDraw(self.tile_size, "assets/Nice_curses_12x12.png")
-        self.status_display = StatusDisplay(1, self.game_state, self.renderer)
-        self.galaxy_map = GalaxyMap(5, self.galaxy_width, self.galaxy_height, self.game_state, self.renderer)
-        self.ship_status = ShipStatus(19, self.game_state, self.renderer)
-        self.sector_map = SectorMap(19, self.game_state, self.renderer)
+        self.game_state = GameState(
+            self.galaxy_width,
+            self.galaxy_height,
+            config.getint("simulation", "seed", fallback=0),
+            config.getint("simulation", "coarse_sectors_per_turn", fallback=256),
+        )
+        self.game_state.load_gameplay(self.__gameplay_values(config))
+        self.game_state.populate_galaxy()
+        # a freshly populated galaxy starts the game
+        self.game_state.game_over = False
+        self.renderer = ARDraw(self.tile_size, self.bundle.image(TILESET_ENTRY) if self.bundle else TILESET_PATH)
+        self.status_display = StatusDisplay(self.game_state, self.renderer)
+        self.galaxy_map = GalaxyMap(self.galaxy_width, self.galaxy_height, self.game_state, self.renderer)
+        self.ship_status = ShipStatus(self.game_state, self.renderer)
+        self.sector_map = SectorMap(self.game_state, self.renderer)
+        self.panels: Dict[str, TemplatePanel] = {
+            GAME_STATUS_PART: self.status_display,
+            GALAXY_MAP_PART: self.galaxy_map,
+            SHIP_STATUS_PART: self.ship_status,
+            SECTOR_MAP_PART: self.sector_map,
+        }
+
+        # cached template layers, keyed by part path, rebuilt individually when their file changes
+        self.scene_layers: Dict[str, Tuple[int, int, pygame.Surface]] = {}
+        for x, y, file_path, template_lines in self.scene_templates:
+            self.__build_layer(x, y, file_path, template_lines)
+
+        self.watcher: Optional[ARWatcher] = None
+        if not self.bundle:
+            self.watcher = ARWatcher([CONFIG_PATH, LAYOUT_PATH] + list(self.scene_layers))
+
+    # The bundle is only used while it is at least as new as every loose file it was built from
+    def __open_bundle(self) -> Optional[AssetBundle]:
+        if not Path(BUNDLE_PATH).exists():
+            return None
+        try:
+            bundle = AssetBundle(BUNDLE_PATH)
+        except ValueError as e:
+            print(f"{e}; loading the loose files instead")
+            return None
+        stale = bundle.stale_sources(ROOT_DIR)
+        if stale:
+            print(f"[SuperTrek78] {BUNDLE_FILE} is older than {', '.join(stale)}; loading the loose files instead")
+            print("[SuperTrek78] Rebuild it with: python make.py bundle")
+            return None
+        return bundle
+
+    def __read_config(self) -> configparser.ConfigParser:
+        config = configparser.ConfigParser()
+        if self.bundle:
+            config.read_string(self.bundle.text(CONFIG_ENTRY))
+        else:
+            config.read(CONFIG_PATH)
+        return config
+
+    # Render a part with its fields blanked out, and hand the fields to the panel drawn over it, if any
+    def __build_layer(self, x: int, y: int, file_path: str, template_lines: List[str]) -> None:
+        lines, fields = ARTemplate.parse_fields(template_lines)
+        layer = self.renderer.render_layer(lines, self.renderer.COLOR_FG1, self.renderer.COLOR_BG)
+        self.scene_layers[file_path] = (x, y, layer)
+        if file_path in self.panels:
+            self.panels[file_path].set_template(x, y, lines, fields)
+
+    @staticmethod
+    def __gameplay_values(config: configparser.ConfigParser) -> Dict[str, str]:
+        return dict(config["gameplay"]) if config.has_section("gameplay") else {}
+
+    def __reload_config(self) -> None:
+        self.game_state.load_gameplay(self.__gameplay_values(self.__read_config()))
+
+    def __reload_layout(self, watcher: ARWatcher) -> None:
+        # placements may have moved, been added or removed: rebuild only parts that differ
+        _, scene_templates = ARTemplate.parse_scene_template(LAYOUT_PATH, str(ROOT_DIR))
+        previous = {part[2]: part[:2] for part in self.scene_templates}
+        self.scene_templates = scene_templates
+        part_paths = [part[2] for part in scene_templates]
+        self.scene_layers = {k: v for k, v in self.scene_layers.items() if k in part_paths}
+        for file_path, panel in self.panels.items():
+            if file_path not in part_paths:
+                panel.set_template(0, 0, [], {})
+        for x, y, file_path, template_lines in scene_templates:
+            if previous.get(file_path) != (x, y):
+                self.__build_layer(x, y, file_path, template_lines)
+                watcher.watch(file_path)
+        watcher.retain([CONFIG_PATH, LAYOUT_PATH] + part_paths)
+
+    # Re-parse and re-render only what changed on disk. [gameplay] values are applied in place;
+    # [scene] changes such as the galaxy size still need a restart. A file that fails to parse is reported and
+    # the last good version stays in use until the next save.
+    def __hot_reload(self) -> None:
+        if not self.watcher:
+            return
+        for path in self.watcher.poll():
+            start = time.perf_counter()
+            name = Path(path).relative_to(ROOT_DIR).as_posix()
+
+            try:
+                if path == CONFIG_PATH:
+                    self.__reload_config()
+                elif path == LAYOUT_PATH:
+                    self.__reload_layout(self.watcher)
+                elif path in self.scene_layers:
+                    template_lines = ARTemplate.parse_scene_template_part(path, strict=True)
+                    x, y, _ = self.scene_layers[path]
+                    self.__build_layer(x, y, path, template_lines)
+                else:
+                    # dropped by a layout edit picked up earlier in this same poll
+                    continue
+            except (OSError, ValueError, configparser.Error) as e:
+                print(f"[SuperTrek78] Failed to reload {name}, keeping the last good version: {e}")
+                pygame.display.set_caption(f"Super Trek 78 - error in {name}: {str(e).splitlines()[0]}")
+                continue
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            over_budget = " (over frame budget)" if elapsed_ms > FRAME_BUDGET_MS else ""
+            print(f"[SuperTrek78] Reloaded {name} in {elapsed_ms:.2f} ms{over_budget}")
+            pygame.display.set_caption(f"Super Trek 78 - reloaded {name} in {elapsed_ms:.2f} ms")
 
     def __draw_game(self):
         self.screen.fill((0, 0, 0))
+        for x, y, layer in self.scene_layers.values():
+            self.screen.blit(layer, (x * self.tile_size, y * self.tile_size))
         self.status_display.draw(self.screen)
         self.galaxy_map.draw(self.screen)
         self.ship_status.draw(self.screen)
@@ -443,7 +640,11 @@ class SuperTrek78:
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     exit()
+                elif event.type == pygame.KEYDOWN and event.key in IMPULSE_KEYS:
+                    if not self.game_state.is_game_over():
+                        self.game_state.impulse(*IMPULSE_KEYS[event.key])
 
+            self.__hot_reload()
             self.__draw_game()
 
 
@@ -10,6 +10,9 @@ VENV_DIR = "venv"
 REQUIREMENTS_FILE = "requirements.txt"
 REQUIREMENTS_DEV_ENVIRON_FILE = "requirements-dev.txt"
 APP_ENTRY = "main.py"
+BUNDLE_ENTRY = "bundle.py"
+BUNDLE_FILE = "supertrek78.bundle"
+VERIFIED_FILE = BUNDLE_FILE + ".verified"
 
 
 def setup():
@@ -44,6 +47,14 @@ def test():
     subprocess.run([python, "-m", "unittest", "discover", "-s", "tests"], check=True)
 
 
+def bundle():
+    python = (
+        os.path.join(VENV_DIR, "bin", "python") if os.name != "nt" else os.path.join(VENV_DIR, "Scripts", "python.exe")
+    )
+    print("[*] Building asset bundle...")
+    subprocess.run([python, BUNDLE_ENTRY], check=True)
+
+
 def clean():
     print("[*] Cleaning up temporary files...")
     for root, dirs, files in os.walk(".", topdown=False):
@@ -53,12 +64,15 @@ def clean():
         for name in dirs:
             if name == "__pycache__":
                 shutil.rmtree(os.path.join(root, name))
+    for name in (BUNDLE_FILE, VERIFIED_FILE):
+        if os.path.isfile(name):
+            os.remove(name)
     print("[*] Clean complete.")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Manage project")
-    parser.add_argument("command", choices=["setup", "run", "test", "clean"], help="Command to run")
+    parser.add_argument("command", choices=["setup", "run", "test", "bundle", "clean"], help="Command to run")
 
     args = parser.parse_args()
     if args.command == "setup":
@@ -67,6 +81,8 @@ def main():
         run()
     elif args.command == "test":
         test()
+    elif args.command == "bundle":
+        bundle()
     elif args.command == "clean":
         clean()
 
@@ -0,0 +1,238 @@
+# simulation.py
+# Level-of-detail simulation of the galaxy.
+#
+# The current sector and its neighbours run at full detail: their contents exist as entities in the EntityStore
+# and the Klingon planner acts on them. Every other sector is only a row in the packed galaxy arrays (enemy count,
+# starbases, planets, siege progress) and is advanced by coarse aggregate rules. Coarse updates are applied a
+# fixed number of sectors per turn, each sector catching up on all the turns since it was last touched, so the
+# cost of a turn does not grow with the galaxy size. All randomness is derived from (seed, sector, turn), so a
+# run is reproducible for a given seed and sequence of player moves.
+
+from __future__ import annotations
+from array import array
+from typing import Dict, List, Set, Tuple
+from entities import KLINGON, PLANET, STAR, STARBASE, EntityStore
+
+# Detail tiers, one byte per sector
+FULL = 0
+COARSE = 1
+
+MAX_ENEMIES = 9
+# Turns a starbase survives with enemies in its sector before it is lost
+SIEGE_TURNS = 5
+# Chance, in quarters per elapsed turn (capped at 3), that a coarse sector sends one Klingon to a neighbour
+MIGRATION_QUARTERS = 3
+SECTOR_SIZE = 12
+
+MASK64 = (1 << 64) - 1
+
+########################################################
+# Helpers
+########################################################
+
+
+# SplitMix64-style hash so each (seed, sector, turn) gets an independent, reproducible random value
+def _mix(seed: int, sector: int, turn: int) -> int:
+    z = (seed * 0x9E3779B97F4A7C15 + sector * 0xBF58476D1CE4E5B9 + turn * 0x94D049BB133111EB) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+########################################################
+# Class GalaxySimulation()
+########################################################
+
+
+class GalaxySimulation:
+
+    def __init__(
+        self,
+        galaxy_width: int,
+        galaxy_height: int,
+        entities: EntityStore,
+        seed: int = 0,
+        coarse_sectors_per_turn: int = 256,
+    ) -> None:
+        self.galaxy_width = galaxy_width
+        self.galaxy_height = galaxy_height
+        self.sector_count = galaxy_width * galaxy_height
+        self.entities = entities
+        self.seed = seed
+        self.coarse_sectors_per_turn = coarse_sectors_per_turn
+        self.turn = 0
+
+        # galaxy arrays, indexed by y * galaxy_width + x
+        self.enemies = array("B", bytes(self.sector_count))
+        self.starbases = array("B", bytes(self.sector_count))
+        self.planets = array("B", bytes(self.sector_count))
+        self.siege = array("B", bytes(self.sector_count))
+        self.tier = array("B", [COARSE]) * self.sector_count
+        self.last_update = array("I", bytes(4 * self.sector_count))
+        self._full: List[int] = []
+        # running total of Klingons held in the arrays; migration conserves it, promotion/demotion move it
+        self._coarse_klingons = 0
+        self._cursor = 0
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Seed the galaxy arrays with the starting number of Klingons and a sprinkling of starbases and planets
+    def populate(self, klingons: int, starbases: int) -> None:
+        for i in range(self.sector_count):
+            self.planets[i] = _mix(self.seed, i, 0) % 3
+        placed = 0
+        attempt = 0
+        while placed < klingons and attempt < klingons * 16:
+            sector = _mix(self.seed, attempt, 1) % self.sector_count
+            attempt += 1
+            if self.enemies[sector] < 3:
+                self.enemies[sector] += 1
+                placed += 1
+        self._coarse_klingons += placed
+        for i in range(starbases):
+            self.starbases[_mix(self.seed, i, 2) % self.sector_count] = 1
+
+    def klingon_count(self) -> int:
+        return self._coarse_klingons + sum(self.entities.count_in_sector(i, KLINGON) for i in self._full)
+
+    # Sectors at full detail: the given sector and its neighbours, clipped to the galaxy edge
+    def neighbourhood(self, sector: int) -> List[int]:
+        sx, sy = sector % self.galaxy_width, sector // self.galaxy_width
+        return [
+            y * self.galaxy_width + x
+            for y in range(max(0, sy - 1), min(self.galaxy_height, sy + 2))
+            for x in range(max(0, sx - 1), min(self.galaxy_width, sx + 2))
+        ]
+
+    def full_sectors(self) -> List[int]:
+        return list(self._full)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Re-tier the galaxy around the player's sector. Sectors leaving full detail are folded back into the arrays;
+    # sectors entering it are first brought up to the current turn, then expanded into entities.
+    def focus(self, sector: int) -> None:
+        wanted: Set[int] = set(self.neighbourhood(sector))
+        for i in self.full_sectors():
+            if i not in wanted:
+                self.demote(i)
+        for i in sorted(wanted):
+            if self.tier[i] == COARSE:
+                self._update_coarse(i, i + 1)
+                self.promote(i)
+
+    # Expand a sector's aggregate counts into entities. Placement only depends on the seed and sector index,
+    # so arriving in the same sector with the same counts always produces the same layout.
+    def promote(self, sector: int) -> None:
+        store = self.entities
+        free = list(range(SECTOR_SIZE * SECTOR_SIZE))
+        r = _mix(self.seed, sector, 3)
+        stars = r % 4
+        kinds = [KLINGON] * self.enemies[sector] + [STARBASE] * self.starbases[sector]
+        kinds += [PLANET] * self.planets[sector] + [STAR] * stars
+        for n, kind in enumerate(kinds):
+            cell = free.pop(_mix(self.seed, sector, 4 + n) % len(free))
+            store.spawn(kind, sector, cell % SECTOR_SIZE, cell // SECTOR_SIZE)
+        # the entities are now authoritative; the arrays are refilled on demotion
+        self._coarse_klingons -= self.enemies[sector]
+        self.enemies[sector] = 0
+        self.starbases[sector] = 0
+        self.tier[sector] = FULL
+        self._full.append(sector)
+        self.last_update[sector] = self.turn
+
+    # Fold a full-detail sector back into the galaxy arrays and free its entities
+    def demote(self, sector: int) -> None:
+        store = self.entities
+        enemies = starbases = 0
+        for entity in list(store.in_sector(sector)):
+            kind = store.type_id[entity]
+            if kind == KLINGON:
+                enemies += 1
+            elif kind == STARBASE:
+                starbases += 1
+            store.remove(entity)
+        self.enemies[sector] = min(enemies, 0xFF)
+        self._coarse_klingons += self.enemies[sector]
+        self.starbases[sector] = starbases
+        self.siege[sector] = 0
+        self.tier[sector] = COARSE
+        self._full.remove(sector)
+        self.last_update[sector] = self.turn
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # The sector one step away in a direction (0 east, 1 west, 2 south, 3 north), or -1 past the galaxy edge
+    def neighbour(self, sector: int, direction: int) -> int:
+        x, y = sector % self.galaxy_width, sector // self.galaxy_width
+        if direction == 0:
+            return sector + 1 if x + 1 < self.galaxy_width else -1
+        if direction == 1:
+            return sector - 1 if x > 0 else -1
+        if direction == 2:
+            return sector + self.galaxy_width if y + 1 < self.galaxy_height else -1
+        return sector - self.galaxy_width if y > 0 else -1
+
+    # Advance coarse sectors [start, end) to the current turn. Migration is applied sector by sector, since a
+    # Klingon may leave the window; siege and starbase losses are whole-slice array updates.
+    def _update_coarse(self, start: int, end: int) -> None:
+        seed, turn = self.seed, self.turn
+        tier = self.tier[start:end]
+        # full-detail sectors are simulated by the AI, so they never accumulate coarse turns
+        elapsed = [0 if t != COARSE else turn - u for t, u in zip(tier, self.last_update[start:end])]
+
+        # Each catching-up sector may send one Klingon to a random orthogonal neighbour inside the galaxy. Every
+        # departure is an arrival next door, so the total number of Klingons is conserved. Klingons that arrived
+        # during this update stay put until the next one.
+        enemies = self.enemies
+        arrived: Dict[int, int] = {}
+        for i, e in enumerate(elapsed):
+            sector = start + i
+            if e == 0 or enemies[sector] <= arrived.get(sector, 0):
+                continue
+            r = _mix(seed, sector, turn)
+            if r % 4 >= min(e, MIGRATION_QUARTERS):
+                continue
+            target = self.neighbour(sector, (r >> 2) % 4)
+            if target >= 0 and self.tier[target] == COARSE and enemies[target] < MAX_ENEMIES:
+                enemies[sector] -= 1
+                enemies[target] += 1
+                arrived[target] = arrived.get(target, 0) + 1
+
+        new_enemies = self.enemies[start:end]
+        starbases = self.starbases[start:end]
+        siege = self.siege[start:end]
+        besieged = [n > 0 and b > 0 for n, b in zip(new_enemies, starbases)]
+        new_siege = [
+            min(s + e, SIEGE_TURNS) if b else s * (t != COARSE) for s, e, b, t in zip(siege, elapsed, besieged, tier)
+        ]
+        fallen = [s >= SIEGE_TURNS for s in new_siege]
+
+        self.starbases[start:end] = array("B", [max(0, n - 1) if f else n for n, f in zip(starbases, fallen)])
+        self.siege[start:end] = array("B", [0 if f else s for s, f in zip(new_siege, fallen)])
+        self.last_update[start:end] = array(
+            "I", [turn if t == COARSE else u for t, u in zip(tier, self.last_update[start:end])]
+        )
+
+    # Advance one turn: a fixed-size window of coarse sectors catches up; full-detail sectors are left to the AI
+    def step(self) -> None:
+        self.turn += 1
+        budget = min(self.coarse_sectors_per_turn, self.sector_count)
+        start = self._cursor
+        end = start + budget
+        if end <= self.sector_count:
+            self._update_coarse(start, end)
+        else:
+            self._update_coarse(start, self.sector_count)
+            self._update_coarse(0, end - self.sector_count)
+        self._cursor = end % self.sector_count
+
+    def sector_summary(self, sector: int) -> Tuple[int, int, int]:
+        if self.tier[sector] == FULL:
+            store = self.entities
+            return (
+                store.count_in_sector(sector, KLINGON),
+                store.count_in_sector(sector, STARBASE),
+                store.count_in_sector(sector, PLANET),
+            )
+        return self.enemies[sector], self.starbases[sector], self.planets[sector]
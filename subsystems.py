@@ -0,0 +1,173 @@
+# subsystems.py
+# Ship subsystem model: energy, shields, cloak, warp drive and the integrity of every damageable system.
+#
+# All values live in one packed array of ints, clamped to each field's range on every write. Every write that
+# actually changes a value sets that field's bit in a change mask, which the status panel drains each frame to
+# redraw only the gauges that moved.
+
+from __future__ import annotations
+import configparser
+import random
+from array import array
+from collections import deque
+from typing import Deque, Dict, Set
+
+# Field indices into ShipSystems.values
+ENERGY = 0
+SHIELDS = 1
+CLOAK_ON = 2
+WARP_FACTOR = 3
+# Integrity of each subsystem, 0-100 %
+CLOAK = 4
+WARP_DRIVE = 5
+COMPUTER = 6
+LIFE_SUPPORT = 7
+SUBSPACE_RADIO = 8
+PHASERS = 9
+TORPEDOES = 10
+DEATH_RAY = 11
+# Energy capacity; kept in the array so gauges drawn relative to it see it change
+MAX_ENERGY = 12
+FIELD_COUNT = 13
+
+# Subsystems that can be damaged and queued for repair
+DAMAGEABLE = (CLOAK, WARP_DRIVE, COMPUTER, LIFE_SUPPORT, SUBSPACE_RADIO, PHASERS, TORPEDOES, DEATH_RAY)
+
+# game.ini [gameplay] keys for each integrity field
+INTEGRITY_KEYS = {
+    CLOAK: "cloak_integrity",
+    WARP_DRIVE: "warp_drive_integrity",
+    COMPUTER: "computer",
+    LIFE_SUPPORT: "life_support",
+    SUBSPACE_RADIO: "subspace_radio",
+    PHASERS: "phasers_integrity",
+    TORPEDOES: "torpedoes_integrity",
+    DEATH_RAY: "death_ray",
+}
+
+# Largest accepted energy capacity and warp factor
+MAX_ENERGY_LIMIT = 1_000_000
+MAX_WARP = 9
+
+# Upper bound of each field; ENERGY is bounded by the current MAX_ENERGY instead
+FIELD_LIMITS = (MAX_ENERGY_LIMIT, 100, 1, MAX_WARP) + (100,) * len(DAMAGEABLE) + (MAX_ENERGY_LIMIT,)
+
+# game.ini [gameplay] keys for the numeric fields; "cloak" is the on/off switch and is read separately
+GAMEPLAY_KEYS = {MAX_ENERGY: "energy", SHIELDS: "shields", WARP_FACTOR: "warp_drive", **INTEGRITY_KEYS}
+
+# Per-turn energy costs
+LIFE_SUPPORT_DRAIN = 1
+CLOAK_DRAIN = 10
+# Shields cost one unit of energy per this many percent of strength
+SHIELD_DRAIN_STEP = 25
+# Integrity points restored per turn to the subsystem at the front of the repair queue
+REPAIR_PER_TURN = 10
+
+########################################################
+# Class ShipSystems()
+########################################################
+
+
+class ShipSystems:
+    __slots__ = ("values", "repair_queue", "_changed")
+
+    def __init__(self, max_energy: int = 1000) -> None:
+        self.values = array("i", [0] * FIELD_COUNT)
+        self.repair_queue: Deque[int] = deque()
+        self._changed = 0
+
+        self.values[MAX_ENERGY] = min(max(max_energy, 0), MAX_ENERGY_LIMIT)
+        self.values[ENERGY] = self.values[MAX_ENERGY]
+        self.values[SHIELDS] = 100
+        for field in DAMAGEABLE:
+            self.values[field] = 100
+        # everything starts out needing a first draw
+        self._changed = (1 << FIELD_COUNT) - 1
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    def get(self, field: int) -> int:
+        return self.values[field]
+
+    @property
+    def max_energy(self) -> int:
+        return self.values[MAX_ENERGY]
+
+    def set(self, field: int, value: int) -> None:
+        value = min(max(value, 0), self.values[MAX_ENERGY] if field == ENERGY else FIELD_LIMITS[field])
+        if self.values[field] != value:
+            self.values[field] = value
+            self._changed |= 1 << field
+
+    # Return the fields changed since the last call and start a new change set
+    def take_changes(self) -> Set[int]:
+        mask, self._changed = self._changed, 0
+        return {field for field in range(FIELD_COUNT) if mask & (1 << field)}
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Apply the game.ini [gameplay] keys present in the section, keeping current values for the rest. Every value
+    # is parsed and range checked before any is assigned, so a bad value raises ValueError and changes nothing.
+    def apply_gameplay(self, gameplay: configparser.SectionProxy) -> None:
+        updates: Dict[int, int] = {}
+        for field, key in GAMEPLAY_KEYS.items():
+            if key in gameplay:
+                value = gameplay.getint(key, fallback=0)
+                if not 0 <= value <= FIELD_LIMITS[field]:
+                    raise ValueError(f"{key} = {value} is outside 0-{FIELD_LIMITS[field]}")
+                updates[field] = value
+        if "cloak" in gameplay:
+            updates[CLOAK_ON] = int(gameplay.getboolean("cloak", fallback=False))
+
+        # a new capacity adds or removes the difference, so the first load starts the ship full and a later
+        # edit does not refill what has been spent
+        if MAX_ENERGY in updates:
+            capacity = updates.pop(MAX_ENERGY)
+            gained = capacity - self.values[MAX_ENERGY]
+            self.set(MAX_ENERGY, capacity)
+            self.set(ENERGY, self.values[ENERGY] + gained)
+        for field, value in updates.items():
+            self.set(field, value)
+            if field in INTEGRITY_KEYS:
+                self.__sync_repair(field)
+
+    # ---------------------------------------------------------------------------------------------------------------- #
+
+    # Damaged subsystems join the back of the repair queue; fully repaired ones leave it
+    def __sync_repair(self, field: int) -> None:
+        if self.values[field] < 100:
+            if field not in self.repair_queue:
+                self.repair_queue.append(field)
+        elif field in self.repair_queue:
+            self.repair_queue.remove(field)
+
+    # Damage a subsystem and queue it for repair
+    def damage(self, field: int, amount: int) -> None:
+        self.set(field, self.values[field] - amount)
+        self.__sync_repair(field)
+
+    # Incoming fire: shields soak up what they can, the rest hits a random subsystem
+    def take_hit(self, amount: int, rng: random.Random) -> None:
+        absorbed = min(amount, self.values[SHIELDS])
+        self.set(SHIELDS, self.values[SHIELDS] - absorbed // 2)
+        if amount > absorbed:
+            self.damage(rng.choice(DAMAGEABLE), amount - absorbed)
+
+    def drain(self, amount: int) -> None:
+        self.set(ENERGY, self.values[ENERGY] - amount)
+
+    # Per-turn upkeep: pay for life support, cloak and shields, then work on the front of the repair queue
+    def end_turn(self) -> None:
+        cost = LIFE_SUPPORT_DRAIN + self.values[SHIELDS] // SHIELD_DRAIN_STEP
+        if self.values[CLOAK_ON]:
+            cost += CLOAK_DRAIN
+        self.drain(cost)
+
+        if self.values[CLOAK] == 0:
+            self.set(CLOAK_ON, 0)
+
+        if self.repair_queue:
+            field = self.repair_queue[0]
+            self.set(field, min(100, self.values[field] + REPAIR_PER_TURN))
+            if self.values[field] == 100:
+                self.repair_queue.popleft()
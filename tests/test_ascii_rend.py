@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from ascii_rend import ARTemplate, ARWatcher
+
+
+class TestARWatcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        self.a = self.write("a.txt", "alpha")
+        self.b = self.write("b.txt", "beta")
+        self.watcher = ARWatcher([self.a, self.b], interval=0)
+
+    # Write a file and move its mtime forward, so the change is seen even on filesystems with coarse timestamps
+    def write(self, name: str, text: str) -> str:
+        path = self.root / name
+        existed = path.exists()
+        mtime = path.stat().st_mtime_ns if existed else 0
+        path.write_text(text, encoding="utf-8")
+        if existed:
+            os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+        return str(path)
+
+    def test_nothing_changed(self) -> None:
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_content_change_is_reported_once(self) -> None:
+        self.write("a.txt", "alpha 2")
+        self.assertEqual(self.watcher.poll(), [self.a])
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_same_size_change_is_reported(self) -> None:
+        self.write("b.txt", "bet4")
+        self.assertEqual(self.watcher.poll(), [self.b])
+
+    def test_unchanged_save_is_not_reported(self) -> None:
+        self.write("a.txt", "alpha")
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_deleted_file_is_reported(self) -> None:
+        os.remove(self.a)
+        self.assertEqual(self.watcher.poll(), [self.a])
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_recreated_file_is_reported(self) -> None:
+        os.remove(self.a)
+        self.watcher.poll()
+        self.write("a.txt", "alpha")
+        self.assertEqual(self.watcher.poll(), [self.a])
+
+    def test_retain_drops_other_paths(self) -> None:
+        self.watcher.retain([self.b])
+        self.write("a.txt", "alpha 2")
+        self.write("b.txt", "beta 2")
+        self.assertEqual(self.watcher.poll(), [self.b])
+
+    def test_watch_adds_a_path(self) -> None:
+        c = self.write("c.txt", "gamma")
+        self.watcher.watch(c)
+        self.write("c.txt", "gamma 2")
+        self.assertEqual(self.watcher.poll(), [c])
+
+    def test_poll_is_rate_limited(self) -> None:
+        watcher = ARWatcher([self.a], interval=3600)
+        watcher.poll()
+        self.write("a.txt", "alpha 2")
+        self.assertEqual(watcher.poll(), [])
+
+
+class TestARTemplate(unittest.TestCase):
+
+    def test_strict_part_read_raises(self) -> None:
+        missing = str(Path(tempfile.gettempdir()) / "no-such-part.txt")
+        self.assertEqual(ARTemplate.parse_scene_template_part(missing), [])
+        with self.assertRaises(FileNotFoundError):
+            ARTemplate.parse_scene_template_part(missing, strict=True)
+
+    def test_fields_are_blanked_and_located(self) -> None:
+        lines, fields = ARTemplate.parse_fields(["║ Date: {{date:4}} ║", "{{bar:3}} {{bar:3}}", "{{name}}|"])
+        self.assertEqual(lines, ["║ Date:      ║", "       ", " " * 8 + "|"])
+        self.assertEqual(fields, {"date": [(8, 0, 4)], "bar": [(0, 1, 3), (4, 1, 3)], "name": [(0, 2, 8)]})
+
+    def test_panel_parts_keep_their_width(self) -> None:
+        root = Path(__file__).resolve().parent.parent / "templates/parts"
+        for name, fields in (
+            ("game_status", {"star_date", "time_left", "klingons"}),
+            ("galaxy_map", {"galaxy_columns", "galaxy_row"}),
+            ("ship_status", {"condition", "energy", "energy_bar", "shields", "shield_bar"}),
+            ("sector_map", {"sector_row"}),
+        ):
+            with self.subTest(part=name):
+                lines, found = ARTemplate.parse_fields(ARTemplate.parse_scene_template_part(str(root / f"{name}.txt")))
+                self.assertLessEqual(fields, set(found))
+                self.assertEqual(len({len(line) for line in lines if line}), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
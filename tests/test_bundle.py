@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+import bundle
+from ascii_rend import ARTemplate
+from bundle import (
+    BUNDLE_FILE,
+    CONFIG_ENTRY,
+    CONFIG_FILE,
+    ICON_ENTRY,
+    ICON_SIZE,
+    LAYOUT_ENTRY,
+    LAYOUT_FILE,
+    ROOT_DIR,
+    SECTION_ALIGN,
+    TILESET_ENTRY,
+    VERIFIED_SUFFIX,
+    AssetBundle,
+    build_bundle,
+)
+
+
+class TestAssetBundle(unittest.TestCase):
+
+    # Build from a copy of the project's assets so the sources can be edited freely
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        shutil.copy2(ROOT_DIR / CONFIG_FILE, self.root / CONFIG_FILE)
+        shutil.copytree(ROOT_DIR / "templates", self.root / "templates")
+        shutil.copytree(ROOT_DIR / "assets", self.root / "assets")
+        self.path = self.root / BUNDLE_FILE
+        self.index = build_bundle(self.root, self.path)
+
+    def test_round_trip(self) -> None:
+        bundle = AssetBundle(str(self.path))
+        self.assertEqual(bundle.text(CONFIG_ENTRY), (self.root / CONFIG_FILE).read_text(encoding="utf-8"))
+        self.assertEqual(
+            bundle.layout(LAYOUT_ENTRY, str(self.root)),
+            ARTemplate.parse_scene_template(str(self.root / LAYOUT_FILE), str(self.root)),
+        )
+        self.assertEqual(bundle.image(ICON_ENTRY).get_size(), ICON_SIZE)
+        self.assertGreater(bundle.image(TILESET_ENTRY).get_width(), 0)
+
+    def test_sections_are_aligned(self) -> None:
+        for entry in self.index.values():
+            self.assertEqual(entry["offset"] % SECTION_ALIGN, 0)
+
+    def test_fresh_bundle_is_not_stale(self) -> None:
+        self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [])
+
+    def test_edited_source_is_stale(self) -> None:
+        with open(self.root / "templates/parts/weapons.txt", "a", encoding="utf-8") as file:
+            file.write("x")
+        self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), ["templates/parts/weapons.txt"])
+
+    def test_same_size_edit_is_stale(self) -> None:
+        config = self.root / CONFIG_FILE
+        text = config.read_text(encoding="utf-8")
+        config.write_text(text.replace("klingons = 10", "klingons = 12"), encoding="utf-8")
+        self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [CONFIG_FILE])
+
+    def test_touched_but_unchanged_source_is_not_stale(self) -> None:
+        config = self.root / CONFIG_FILE
+        stat = config.stat()
+        os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with mock.patch("bundle._digest", wraps=bundle._digest) as digest:
+            self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [])
+            self.assertEqual(digest.call_count, 1)
+            # the verified mtime is remembered, so the next start does not hash the file again
+            self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [])
+            self.assertEqual(digest.call_count, 1)
+
+    def test_verified_touch_does_not_hide_a_later_edit(self) -> None:
+        config = self.root / CONFIG_FILE
+        stat = config.stat()
+        os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [])
+        text = config.read_text(encoding="utf-8")
+        config.write_text(text.replace("klingons = 10", "klingons = 12"), encoding="utf-8")
+        os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+        self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [CONFIG_FILE])
+
+    def test_rebuild_discards_verifications(self) -> None:
+        config = self.root / CONFIG_FILE
+        stat = config.stat()
+        os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        AssetBundle(str(self.path)).stale_sources(self.root)
+        verified = Path(str(self.path) + VERIFIED_SUFFIX)
+        self.assertTrue(verified.exists())
+        build_bundle(self.root, self.path)
+        self.assertFalse(verified.exists())
+
+    def test_missing_sources_are_not_stale(self) -> None:
+        shutil.rmtree(self.root / "templates")
+        self.assertEqual(AssetBundle(str(self.path)).stale_sources(self.root), [])
+
+    def test_rejects_truncated_bundles(self) -> None:
+        data = self.path.read_bytes()
+        for length in (0, 5, len(data) - 1):
+            with self.subTest(length=length):
+                self.path.write_bytes(data[:length])
+                with self.assertRaises(ValueError):
+                    AssetBundle(str(self.path))
+
+    def test_rejects_other_files(self) -> None:
+        with self.assertRaises(ValueError):
+            AssetBundle(str(self.root / CONFIG_FILE))
+
+
+if __name__ == "__main__":
+    unittest.main()
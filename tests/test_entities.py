@@ -0,0 +1,69 @@
+import unittest
+from entities import ENTITY_TYPES, FREE, KLINGON, PLANET, STAR, STARBASE, EntityStore
+
+
+class TestEntityStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.store = EntityStore(sector_count=100)
+
+    def test_spawn_starts_at_full_hull(self) -> None:
+        entity = self.store.spawn(KLINGON, 3, 1, 2)
+        self.assertEqual(self.store.hull[entity], ENTITY_TYPES[KLINGON].max_hull)
+        self.assertEqual((self.store.x[entity], self.store.y[entity]), (1, 2))
+        self.assertEqual(self.store.entity_type(entity).name, "klingon")
+
+    def test_in_sector_tracks_spawn_remove_and_move(self) -> None:
+        a = self.store.spawn(KLINGON, 2, 0, 0)
+        b = self.store.spawn(STAR, 0, 0, 0)
+        c = self.store.spawn(KLINGON, 2, 5, 5)
+        self.assertEqual(sorted(self.store.in_sector(2)), [a, c])
+        self.assertEqual(list(self.store.in_sector(0)), [b])
+        self.assertEqual(list(self.store.in_sector(99)), [])
+
+        self.store.move(c, 7, 1, 1)
+        self.assertEqual(list(self.store.in_sector(2)), [a])
+        self.assertEqual(list(self.store.in_sector(7)), [c])
+
+        self.store.remove(a)
+        self.assertEqual(list(self.store.in_sector(2)), [])
+        self.assertEqual(sorted(self.store.occupied_sectors()), [0, 7])
+
+    def test_only_occupied_sectors_are_indexed(self) -> None:
+        for sector in (5, 5, 42):
+            self.store.spawn(PLANET, sector, 0, 0)
+        self.assertEqual(sorted(self.store.occupied_sectors()), [5, 42])
+
+    def test_removed_ids_are_reused(self) -> None:
+        a = self.store.spawn(KLINGON, 1, 0, 0)
+        self.store.remove(a)
+        self.assertEqual(self.store.type_id[a], FREE)
+        self.assertEqual(len(self.store), 0)
+        b = self.store.spawn(STARBASE, 4, 0, 0)
+        self.assertEqual(a, b)
+        self.assertEqual(list(self.store.in_sector(1)), [])
+        self.assertEqual(list(self.store.in_sector(4)), [b])
+
+    def test_remove_twice_is_harmless(self) -> None:
+        a = self.store.spawn(KLINGON, 1, 0, 0)
+        self.store.remove(a)
+        self.store.remove(a)
+        self.assertEqual(len(self.store), 0)
+
+    def test_damage_destroys_at_zero_hull(self) -> None:
+        a = self.store.spawn(KLINGON, 1, 0, 0)
+        self.assertFalse(self.store.damage(a, 100))
+        self.assertEqual(self.store.hull[a], ENTITY_TYPES[KLINGON].max_hull - 100)
+        self.assertTrue(self.store.damage(a, 10_000))
+        self.assertEqual(self.store.count_in_sector(1, KLINGON), 0)
+
+    def test_memory_report(self) -> None:
+        for i in range(50):
+            self.store.spawn(KLINGON, i, 0, 0)
+        report = self.store.memory_report()
+        self.assertEqual(report["entities"], 50)
+        self.assertEqual(report["total_bytes"], 50 * EntityStore.bytes_per_entity())
+
+
+if __name__ == "__main__":
+    unittest.main()
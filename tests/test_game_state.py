@@ -0,0 +1,139 @@
+import unittest
+from unittest import mock
+from entities import ENTITY_TYPES, KLINGON
+from klingon_ai import FIRE, IDLE
+from main import GameState
+from simulation import SECTOR_SIZE
+from subsystems import ENERGY, PHASERS, SHIELDS, ShipSystems
+
+
+def make_state(width: int = 10, height: int = 10) -> GameState:
+    state = GameState(width, height, seed=78)
+    state.klingons_remaining = 20
+    state.populate_galaxy()
+    state.game_over = False
+    return state
+
+
+class TestGameStateTurns(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.state = make_state()
+        self.sector = self.state.sector_index(self.state.current_sector)
+        # start every test from a quiet sector
+        for entity in list(self.state.entities.in_sector(self.sector)):
+            self.state.entities.remove(entity)
+
+    def plan(self, entity: int, action: int) -> None:
+        actions = self.state.klingon_ai.actions
+        actions.extend([IDLE] * (entity + 1 - len(actions)))
+        actions[entity] = action
+
+    def test_enemy_fire_reaches_the_ship(self) -> None:
+        shooter = self.state.entities.spawn(KLINGON, self.sector, 5, 6)
+        self.state.entities.spawn(KLINGON, self.sector, 0, 0)
+        self.plan(shooter, FIRE)
+        with mock.patch.object(ShipSystems, "take_hit") as take_hit:
+            self.state.resolve_enemy_fire()
+        take_hit.assert_called_once_with(ENTITY_TYPES[KLINGON].phaser_power // 4, self.state.rng)
+
+    def test_damaged_klingons_hit_softer(self) -> None:
+        shooter = self.state.entities.spawn(KLINGON, self.sector, 5, 6)
+        self.state.entities.damage(shooter, ENTITY_TYPES[KLINGON].max_hull // 2)
+        self.plan(shooter, FIRE)
+        with mock.patch.object(ShipSystems, "take_hit") as take_hit:
+            self.state.resolve_enemy_fire()
+        self.assertEqual(take_hit.call_args[0][0], ENTITY_TYPES[KLINGON].phaser_power // 8)
+
+    def test_end_turn_resolves_fire_before_replanning(self) -> None:
+        shooter = self.state.entities.spawn(KLINGON, self.sector, 5, 6)
+        self.plan(shooter, FIRE)
+        shields = self.state.shields
+        self.state.end_turn()
+        self.assertLess(self.state.shields, shields)
+
+    def test_upkeep_ends_the_game_when_energy_runs_out(self) -> None:
+        self.state.systems.set(ENERGY, 1)
+        self.state.end_turn()
+        self.assertEqual(self.state.energy, 0)
+        self.assertTrue(self.state.game_over)
+
+    def test_end_turn_resyncs_klingons_remaining(self) -> None:
+        self.state.klingons_remaining = 999
+        self.state.end_turn()
+        self.assertEqual(self.state.klingons_remaining, self.state.simulation.klingon_count())
+
+    def test_impulse_moves_and_ends_the_turn(self) -> None:
+        self.state.player_position = (5, 5)
+        self.state.impulse(1, -1)
+        self.assertEqual(self.state.player_position, (6, 4))
+        self.assertEqual(self.state.simulation.turn, 1)
+
+    def test_impulse_across_the_edge_enters_the_next_sector(self) -> None:
+        self.state.player_position = (SECTOR_SIZE - 1, 3)
+        self.state.impulse(1, 0)
+        self.assertEqual(self.state.current_sector, (1, 0))
+        self.assertEqual(self.state.player_position, (0, 3))
+        self.assertIn(self.state.sector_index((2, 1)), self.state.simulation.full_sectors())
+
+    def test_impulse_is_blocked_by_the_galaxy_edge(self) -> None:
+        self.state.player_position = (0, 0)
+        self.state.impulse(-1, 0)
+        self.assertEqual(self.state.current_sector, (0, 0))
+        self.assertEqual(self.state.player_position, (0, 0))
+        self.assertEqual(self.state.simulation.turn, 0)
+
+    def test_arriving_klingons_have_no_plan(self) -> None:
+        shooter = self.state.entities.spawn(KLINGON, self.sector, 5, 6)
+        self.plan(shooter, FIRE)
+        self.state.enter_sector((5, 5))
+        here = self.state.entities.in_sector(self.state.sector_index((5, 5)))
+        self.assertTrue(all(self.state.klingon_ai.action(entity) == IDLE for entity in here))
+
+
+class TestLoadGameplay(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.state = GameState(10, 10)
+        self.values = {"star_date": "2250", "klingons": "10", "energy": "1000", "shields": "84"}
+        self.state.load_gameplay(self.values)
+
+    def test_first_load_applies_everything(self) -> None:
+        self.assertEqual(self.state.star_date, 2250)
+        self.assertEqual(self.state.klingons_remaining, 10)
+        self.assertEqual(self.state.shields, 84)
+
+    def test_reload_applies_only_changed_keys(self) -> None:
+        self.state.systems.drain(300)
+        self.state.systems.damage(PHASERS, 40)
+        self.state.star_date = 2260
+        self.state.load_gameplay(dict(self.values, shields="50"))
+        self.assertEqual(self.state.shields, 50)
+        self.assertEqual(self.state.energy, 700)
+        self.assertEqual(self.state.systems.get(PHASERS), 60)
+        self.assertEqual(self.state.star_date, 2260)
+
+    def test_unchanged_reload_applies_nothing(self) -> None:
+        self.state.systems.take_changes()
+        self.state.load_gameplay(dict(self.values))
+        self.assertEqual(self.state.systems.take_changes(), set())
+
+    def test_bad_value_leaves_the_state_unchanged(self) -> None:
+        with self.assertRaises(ValueError):
+            self.state.load_gameplay(dict(self.values, star_date="2300", shields="lots"))
+        with self.assertRaises(ValueError):
+            self.state.load_gameplay(dict(self.values, star_date="2300", klingons="many"))
+        self.assertEqual(self.state.star_date, 2250)
+        self.assertEqual(self.state.klingons_remaining, 10)
+        self.assertEqual(self.state.systems.get(SHIELDS), 84)
+
+    def test_fixing_a_bad_value_applies_the_whole_edit(self) -> None:
+        with self.assertRaises(ValueError):
+            self.state.load_gameplay(dict(self.values, star_date="2300", shields="lots"))
+        self.state.load_gameplay(dict(self.values, star_date="2300", shields="60"))
+        self.assertEqual(self.state.star_date, 2300)
+        self.assertEqual(self.state.shields, 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import itertools
+import unittest
+from entities import KLINGON, PLANET, STARBASE, EntityStore
+from klingon_ai import (
+    ALLY_STEPS,
+    CALL_REINFORCEMENTS,
+    DISTANCE_ABSENT,
+    DISTANCE_STEPS,
+    ENERGY_STEPS,
+    FIRE,
+    FLEE,
+    HULL_STEPS,
+    IDLE,
+    MOVE,
+    SHIELD_STEPS,
+    KlingonPlanner,
+    decide,
+)
+
+# (hull, distance, shields, energy, allies, starbase) -> expected action
+DECISIONS = [
+    # healthy, in range of a weakened player: fire
+    ((3, 0, 1, 1, 1, False), FIRE),
+    ((3, 1, 0, 0, 0, False), FIRE),
+    # healthy but far away: close in
+    ((3, 3, 1, 1, 1, False), MOVE),
+    ((3, 3, 3, 3, 2, False), MOVE),
+    # crippled, alone, facing a strong player: flee
+    ((0, 0, 3, 3, 0, False), FLEE),
+    ((0, 2, 2, 2, 0, False), FLEE),
+    # still fighting fit but outmatched and alone: call for help
+    ((2, 1, 3, 3, 0, False), CALL_REINFORCEMENTS),
+    ((1, 0, 3, 3, 0, False), CALL_REINFORCEMENTS),
+    # player absent, healthy at a starbase: besiege it
+    ((3, DISTANCE_ABSENT, 0, 0, 0, True), FIRE),
+    ((2, DISTANCE_ABSENT, 3, 3, 1, True), FIRE),
+    # player absent, weak and alone at a starbase: call for help
+    ((1, DISTANCE_ABSENT, 0, 0, 0, True), CALL_REINFORCEMENTS),
+    ((0, DISTANCE_ABSENT, 0, 0, 0, True), CALL_REINFORCEMENTS),
+    # player absent, crippled with nothing to attack: flee
+    ((0, DISTANCE_ABSENT, 0, 0, 0, False), FLEE),
+    # player absent, nothing to attack: patrol
+    ((3, DISTANCE_ABSENT, 0, 0, 2, False), MOVE),
+    ((1, DISTANCE_ABSENT, 3, 3, 0, False), MOVE),
+]
+
+
+class TestDecide(unittest.TestCase):
+
+    def test_decision_table(self) -> None:
+        for situation, expected in DECISIONS:
+            with self.subTest(situation=situation):
+                self.assertEqual(decide(situation), expected)
+
+    def test_every_action_is_reachable(self) -> None:
+        situations = itertools.product(
+            range(len(HULL_STEPS) + 1),
+            list(range(len(DISTANCE_STEPS) + 1)) + [DISTANCE_ABSENT],
+            range(len(SHIELD_STEPS) + 1),
+            range(len(ENERGY_STEPS) + 1),
+            range(len(ALLY_STEPS) + 1),
+            (False, True),
+        )
+        chosen = {decide(situation) for situation in situations}
+        self.assertEqual(chosen, {MOVE, FIRE, FLEE, CALL_REINFORCEMENTS})
+
+
+class TestKlingonPlanner(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.store = EntityStore(sector_count=16)
+        self.planner = KlingonPlanner(self.store, max_entities_per_turn=4)
+
+    def test_plan_sector_plans_only_klingons(self) -> None:
+        klingon = self.store.spawn(KLINGON, 0, 5, 5)
+        planet = self.store.spawn(PLANET, 0, 1, 1)
+        self.assertEqual(self.planner.plan_sector(0, (5, 6), 10, 100), 1)
+        self.assertEqual(self.planner.action(klingon), FIRE)
+        self.assertEqual(self.planner.action(planet), IDLE)
+
+    def test_reused_id_does_not_inherit_another_klingons_plan(self) -> None:
+        klingon = self.store.spawn(KLINGON, 0, 5, 5)
+        self.planner.plan_sector(0, (5, 6), 10, 100)
+        self.assertEqual(self.planner.action(klingon), FIRE)
+        self.store.remove(klingon)
+        newcomer = self.store.spawn(KLINGON, 9, 0, 0)
+        self.assertEqual(newcomer, klingon)
+        self.assertEqual(self.planner.action(newcomer), IDLE)
+
+    def test_reused_id_does_not_inherit_the_old_plan(self) -> None:
+        klingon = self.store.spawn(KLINGON, 0, 5, 5)
+        self.planner.plan_sector(0, (5, 6), 10, 100)
+        self.store.remove(klingon)
+        planet = self.store.spawn(PLANET, 0, 5, 5)
+        self.assertEqual(planet, klingon)
+        self.assertEqual(self.planner.action(planet), IDLE)
+
+    def test_plan_turn_respects_the_budget(self) -> None:
+        for sector in range(1, 9):
+            self.store.spawn(KLINGON, sector, 0, 0)
+            self.store.spawn(STARBASE, sector, 1, 1)
+        planned = self.planner.plan_turn(0, (5, 5), 50, 500)
+        self.assertEqual(planned, 4)
+        # the next turn picks up where this one stopped
+        self.planner.plan_turn(0, (5, 5), 50, 500)
+        planned_ids = [e for e in range(len(self.store.type_id)) if self.planner.action(e) != IDLE]
+        self.assertEqual(len(planned_ids), 8)
+
+    def test_crowded_visible_sector_is_capped_and_resumed(self) -> None:
+        klingons = [self.store.spawn(KLINGON, 0, 5, 6) for _ in range(10)]
+        self.assertEqual(self.planner.plan_turn(0, (5, 5), 10, 100, []), 4)
+        self.assertEqual([self.planner.action(k) != IDLE for k in klingons], [True] * 4 + [False] * 6)
+        self.assertEqual(self.planner.plan_turn(0, (5, 5), 10, 100, []), 4)
+        self.assertEqual(self.planner.plan_turn(0, (5, 5), 10, 100, []), 2)
+        self.assertTrue(all(self.planner.action(k) != IDLE for k in klingons))
+
+    def test_crowded_offscreen_sector_is_planned_in_slices(self) -> None:
+        klingons = [self.store.spawn(KLINGON, 3, 0, 0) for _ in range(6)]
+        other = self.store.spawn(KLINGON, 5, 0, 0)
+        for _ in range(2):
+            self.assertLessEqual(self.planner.plan_turn(0, (5, 5), 50, 500, [3, 5]), 4)
+        self.assertTrue(all(self.planner.action(k) != IDLE for k in klingons + [other]))
+
+
+if __name__ == "__main__":
+    unittest.main()
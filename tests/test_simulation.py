@@ -0,0 +1,97 @@
+import unittest
+from entities import EntityStore
+from simulation import COARSE, FULL, GalaxySimulation
+
+
+def make_simulation(width: int = 20, height: int = 20, klingons: int = 60, seed: int = 78) -> GalaxySimulation:
+    simulation = GalaxySimulation(width, height, EntityStore(width * height), seed=seed, coarse_sectors_per_turn=64)
+    simulation.populate(klingons, starbases=5)
+    return simulation
+
+
+def layout(simulation: GalaxySimulation, sector: int) -> list:
+    store = simulation.entities
+    return sorted((store.type_id[e], store.x[e], store.y[e]) for e in store.in_sector(sector))
+
+
+class TestGalaxySimulation(unittest.TestCase):
+
+    def test_populate_places_every_klingon(self) -> None:
+        simulation = make_simulation()
+        self.assertEqual(simulation.klingon_count(), 60)
+
+    def test_migration_conserves_klingons(self) -> None:
+        simulation = make_simulation()
+        simulation.focus(0)
+        for turn in range(200):
+            simulation.step()
+            if turn % 25 == 0:
+                simulation.focus((turn * 37) % simulation.sector_count)
+        self.assertEqual(simulation.klingon_count(), 60)
+
+    def test_neighbourhood_is_clipped_to_the_galaxy(self) -> None:
+        simulation = make_simulation(width=5, height=4)
+        self.assertEqual(sorted(simulation.neighbourhood(0)), [0, 1, 5, 6])
+        self.assertEqual(len(simulation.neighbourhood(6)), 9)
+        self.assertEqual(sorted(simulation.neighbourhood(19)), [13, 14, 18, 19])
+
+    def test_focus_promotes_only_the_neighbourhood(self) -> None:
+        simulation = make_simulation()
+        simulation.focus(21)
+        self.assertEqual(sorted(simulation.full_sectors()), sorted(simulation.neighbourhood(21)))
+        self.assertEqual(simulation.tier[21], FULL)
+        self.assertEqual(simulation.tier[200], COARSE)
+        # only full-detail sectors hold entities
+        self.assertLessEqual(set(simulation.entities.occupied_sectors()), set(simulation.full_sectors()))
+
+    def test_promotion_is_deterministic(self) -> None:
+        first = make_simulation()
+        second = make_simulation()
+        first.focus(21)
+        second.focus(21)
+        self.assertEqual(layout(first, 21), layout(second, 21))
+
+        # leaving and coming back without any turns passing restores the same layout
+        before = layout(first, 21)
+        first.focus(300)
+        self.assertEqual(first.tier[21], COARSE)
+        first.focus(21)
+        self.assertEqual(layout(first, 21), before)
+
+    def test_sector_summary_matches_across_tiers(self) -> None:
+        simulation = make_simulation()
+        coarse = [simulation.sector_summary(i) for i in simulation.neighbourhood(21)]
+        simulation.focus(21)
+        full = [simulation.sector_summary(i) for i in simulation.neighbourhood(21)]
+        self.assertEqual(coarse, full)
+
+    def test_neighbour_is_clipped_to_the_galaxy(self) -> None:
+        simulation = make_simulation(width=10, height=10)
+        self.assertEqual([simulation.neighbour(9, d) for d in range(4)], [-1, 8, 19, -1])
+        self.assertEqual([simulation.neighbour(90, d) for d in range(4)], [91, -1, -1, 80])
+        self.assertEqual([simulation.neighbour(55, d) for d in range(4)], [56, 54, 65, 45])
+
+    def test_migration_moves_to_orthogonal_neighbours_only(self) -> None:
+        simulation = GalaxySimulation(10, 10, EntityStore(100), seed=78, coarse_sectors_per_turn=100)
+        simulation.enemies[9] = 1
+        simulation._coarse_klingons = 1
+        sector, rows = 9, {0}
+        for _ in range(300):
+            simulation.step()
+            (current,) = [i for i in range(100) if simulation.enemies[i]]
+            if current != sector:
+                dx, dy = abs(current % 10 - sector % 10), abs(current // 10 - sector // 10)
+                self.assertEqual(dx + dy, 1, f"{sector} -> {current}")
+                sector = current
+                rows.add(sector // 10)
+        self.assertGreater(len(rows), 1)
+
+    def test_step_only_touches_its_window(self) -> None:
+        simulation = make_simulation(width=100, height=100)
+        simulation.step()
+        touched = [i for i in range(simulation.sector_count) if simulation.last_update[i] == simulation.turn]
+        self.assertEqual(touched, list(range(64)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import configparser
+import random
+import unittest
+from subsystems import (
+    CLOAK_ON,
+    COMPUTER,
+    DAMAGEABLE,
+    ENERGY,
+    FIELD_COUNT,
+    MAX_ENERGY,
+    PHASERS,
+    SHIELDS,
+    TORPEDOES,
+    WARP_DRIVE,
+    ShipSystems,
+)
+
+
+def gameplay(**values: object) -> configparser.SectionProxy:
+    parser = configparser.ConfigParser()
+    parser.read_dict({"gameplay": {key: str(value) for key, value in values.items()}})
+    return parser["gameplay"]
+
+
+def fresh_systems(max_energy: int = 1000) -> ShipSystems:
+    systems = ShipSystems(max_energy)
+    systems.take_changes()
+    return systems
+
+
+class TestChangeMask(unittest.TestCase):
+
+    def test_everything_starts_changed(self) -> None:
+        self.assertEqual(ShipSystems().take_changes(), set(range(FIELD_COUNT)))
+
+    def test_take_changes_drains_the_mask(self) -> None:
+        systems = fresh_systems()
+        systems.set(SHIELDS, 50)
+        systems.drain(10)
+        self.assertEqual(systems.take_changes(), {SHIELDS, ENERGY})
+        self.assertEqual(systems.take_changes(), set())
+
+    def test_writing_the_same_value_is_not_a_change(self) -> None:
+        systems = fresh_systems()
+        systems.set(SHIELDS, systems.get(SHIELDS))
+        self.assertEqual(systems.take_changes(), set())
+
+    def test_capacity_change_is_reported(self) -> None:
+        systems = fresh_systems()
+        systems.apply_gameplay(gameplay(energy=2000))
+        self.assertEqual(systems.take_changes(), {MAX_ENERGY, ENERGY})
+
+
+class TestRanges(unittest.TestCase):
+
+    def test_large_energy(self) -> None:
+        systems = fresh_systems()
+        systems.apply_gameplay(gameplay(energy=40000))
+        self.assertEqual(systems.get(ENERGY), 40000)
+        self.assertEqual(systems.max_energy, 40000)
+
+    def test_writes_are_clamped(self) -> None:
+        systems = fresh_systems()
+        systems.set(SHIELDS, 250)
+        systems.set(ENERGY, 5000)
+        systems.drain(10**9)
+        self.assertEqual(systems.get(SHIELDS), 100)
+        self.assertEqual(systems.get(ENERGY), 0)
+
+    def test_out_of_range_value_changes_nothing(self) -> None:
+        systems = fresh_systems()
+        with self.assertRaises(ValueError):
+            systems.apply_gameplay(gameplay(shields=10, computer=150))
+        with self.assertRaises(ValueError):
+            systems.apply_gameplay(gameplay(shields=10, energy="lots"))
+        self.assertEqual(systems.get(SHIELDS), 100)
+        self.assertEqual(systems.take_changes(), set())
+
+
+class TestApplyGameplay(unittest.TestCase):
+
+    def test_missing_keys_keep_their_values(self) -> None:
+        systems = fresh_systems()
+        systems.drain(300)
+        systems.damage(PHASERS, 40)
+        systems.apply_gameplay(gameplay(shields=60))
+        self.assertEqual(systems.get(SHIELDS), 60)
+        self.assertEqual(systems.get(ENERGY), 700)
+        self.assertEqual(systems.get(PHASERS), 60)
+
+    def test_new_capacity_keeps_spent_energy_spent(self) -> None:
+        systems = fresh_systems()
+        systems.drain(300)
+        systems.apply_gameplay(gameplay(energy=1500))
+        self.assertEqual(systems.get(ENERGY), 1200)
+        systems.apply_gameplay(gameplay(energy=500))
+        self.assertEqual(systems.get(ENERGY), 200)
+
+    def test_cloak_switch(self) -> None:
+        systems = fresh_systems()
+        systems.apply_gameplay(gameplay(cloak="on"))
+        self.assertEqual(systems.get(CLOAK_ON), 1)
+        with self.assertRaises(ValueError):
+            systems.apply_gameplay(gameplay(cloak="maybe"))
+
+
+class TestRepairQueue(unittest.TestCase):
+
+    def test_loaded_damage_is_queued(self) -> None:
+        systems = fresh_systems()
+        systems.apply_gameplay(gameplay(phasers_integrity=84, torpedoes_integrity=32))
+        self.assertEqual(list(systems.repair_queue), [PHASERS, TORPEDOES])
+
+    def test_loaded_repair_leaves_the_queue(self) -> None:
+        systems = fresh_systems()
+        systems.damage(COMPUTER, 30)
+        systems.damage(WARP_DRIVE, 30)
+        systems.apply_gameplay(gameplay(computer=100))
+        self.assertEqual(list(systems.repair_queue), [WARP_DRIVE])
+
+    def test_repairs_work_through_the_queue_in_order(self) -> None:
+        systems = fresh_systems()
+        systems.damage(COMPUTER, 15)
+        systems.damage(PHASERS, 5)
+        for _ in range(2):
+            systems.end_turn()
+        self.assertEqual(systems.get(COMPUTER), 100)
+        self.assertEqual(list(systems.repair_queue), [PHASERS])
+        systems.end_turn()
+        self.assertEqual(systems.get(PHASERS), 100)
+        self.assertEqual(list(systems.repair_queue), [])
+
+    def test_hit_past_the_shields_damages_a_subsystem(self) -> None:
+        systems = fresh_systems()
+        systems.set(SHIELDS, 10)
+        systems.take_changes()
+        systems.take_hit(50, random.Random(1))
+        self.assertEqual(systems.get(SHIELDS), 5)
+        self.assertEqual(len(systems.repair_queue), 1)
+        self.assertIn(systems.repair_queue[0], DAMAGEABLE)
+        self.assertEqual(systems.get(systems.repair_queue[0]), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()